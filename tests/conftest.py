@@ -0,0 +1,6 @@
+import os
+
+
+# zodiac.config читает переменные окружения при импорте; самим тестам база не нужна
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("CHART_WORKERS", "0")
@@ -0,0 +1,94 @@
+import pytest
+
+from zodiac.entities.dto.astro import ChartSnapshot
+from zodiac.services.astrology import AstroChart
+
+
+# Карта из примера в zodiac.services.astrology (Томск, 2002-05-25 13:00) в виде снимка
+# и её представления так, как их строил прежний AstroChart со списками PlanetPosition.
+# Снимок не требует эфемерид, поэтому сравнение точное.
+SNAPSHOT = ChartSnapshot.model_validate({
+    "birth_time": "2002-05-25T13:00:00",
+    "latitude": 56.484645,
+    "longitude": 84.947649,
+    "ascendant": 251.44739769987356,
+    "longitudes": [
+        64.14517458321865,
+        231.4261892597093,
+        66.81600586715274,
+        95.96141363787173,
+        88.05710595718844,
+        105.29715784260576,
+        76.52381885078766,
+        328.8059556206847,
+        310.94200982690995,
+        256.6120152741401,
+    ],
+    "lunar_node": 347.28101467649066,
+})
+EXPECTED_VIEWS = {
+    "planets": [
+        ("Sun", 64.14517458321865, "Близнецы", 6),
+        ("Moon", 231.4261892597093, "Скорпион", 12),
+        ("Mercury", 66.81600586715274, "Близнецы", 6),
+        ("Venus", 95.96141363787173, "Рак", 7),
+        ("Mars", 88.05710595718844, "Близнецы", 7),
+        ("Jupiter", 105.29715784260576, "Рак", 8),
+        ("Saturn", 76.52381885078766, "Близнецы", 7),
+        ("Uranus", 328.8059556206847, "Водолей", 3),
+        ("Neptune", 310.94200982690995, "Водолей", 2),
+        ("Pluto", 256.6120152741401, "Стрелец", 1),
+    ],
+    "houses": [
+        ("House 1", 251.44739769987356, "Стрелец"),
+        ("House 2", 281.4473976998736, "Козерог"),
+        ("House 3", 311.4473976998736, "Водолей"),
+        ("House 4", 341.4473976998736, "Рыбы"),
+        ("House 5", 11.44739769987359, "Овен"),
+        ("House 6", 41.44739769987359, "Телец"),
+        ("House 7", 71.44739769987359, "Близнецы"),
+        ("House 8", 101.44739769987359, "Рак"),
+        ("House 9", 131.4473976998736, "Лев"),
+        ("House 10", 161.4473976998736, "Дева"),
+        ("House 11", 191.4473976998736, "Весы"),
+        ("House 12", 221.4473976998736, "Скорпион"),
+    ],
+    "aspects": [
+        ("Sun", "Mercury", "Соединение", 2.670831283934092, 6, 6),
+        ("Sun", "Venus", "Полусекстиль", 31.81623905465308, 6, 7),
+        ("Sun", "Uranus", "Квадратура", 95.33921896253395, 6, 3),
+        ("Sun", "Neptune", "Трин", 113.2031647563087, 6, 2),
+        ("Moon", "Mars", "Би-квинтиль", 143.36908330252086, 12, 7),
+        ("Moon", "Jupiter", "Трин", 126.12903141710355, 12, 8),
+        ("Moon", "Uranus", "Квадратура", 97.3797663609754, 12, 3),
+        ("Mercury", "Venus", "Полусекстиль", 29.14540777071899, 6, 7),
+        ("Mercury", "Neptune", "Трин", 115.87399604024279, 6, 2),
+        ("Venus", "Mars", "Соединение", 7.904307680683289, 7, 7),
+        ("Venus", "Uranus", "Трин", 127.15545801718702, 7, 3),
+        ("Venus", "Neptune", "Би-квинтиль", 145.01940381096176, 7, 2),
+        ("Mars", "Uranus", "Трин", 119.25115033650374, 7, 3),
+        ("Jupiter", "Saturn", "Полусекстиль", 28.773338991818093, 8, 7),
+        ("Jupiter", "Pluto", "Квинкункс", 151.31485743153434, 8, 1),
+        ("Saturn", "Neptune", "Трин", 125.58180902387772, 7, 2),
+        ("Saturn", "Pluto", "Оппозиция", 179.91180357664757, 7, 1),
+        ("Uranus", "Pluto", "Квинтиль", 72.1939403465446, 3, 1),
+    ],
+    "lunar_node": [(347.28101467649066, "Вода")],
+}
+
+
+def dump_view(chart: AstroChart, view: str) -> list[tuple]:
+    models = getattr(chart, view)
+    if not isinstance(models, list):
+        models = [models]
+    return [tuple(model.model_dump(mode="json").values()) for model in models]
+
+
+@pytest.mark.parametrize("view", EXPECTED_VIEWS)
+def test_views_match_previous_output(view: str) -> None:
+    chart = AstroChart.from_snapshot(SNAPSHOT)
+    assert dump_view(chart, view) == EXPECTED_VIEWS[view]
+
+
+def test_snapshot_round_trip() -> None:
+    assert AstroChart.from_snapshot(SNAPSHOT).to_snapshot() == SNAPSHOT
@@ -0,0 +1,99 @@
+from collections.abc import Sequence
+
+import numpy as np
+import pytest
+
+from zodiac.entities.dto.astro import ASPECTS, ASPECT_RANGES
+from zodiac.services.astrology import PLANET_NAMES
+from zodiac.services.compatibility import (
+    ASPECT_NAMES,
+    COMPATIBILITY_PAIRS,
+    aspect_indices,
+    compatibility_matrix,
+)
+
+
+def aspect_score_reference(angle: float) -> float:
+    """
+    Эталон для aspect_scores: прежний поаспектный расчёт AstroChart.calculate_aspect_score
+    (первый аспект в порядке ASPECTS, в орбис которого попадает угол).
+    """
+    for aspect in ASPECTS:
+        orb = abs(angle - aspect["angle"])
+        if orb <= aspect["orb"]:
+            return max(0, aspect["score"] * ((aspect["orb"] - orb) / aspect["orb"]))
+    return 0.0
+
+
+def compatibility_reference(first: Sequence[float], second: Sequence[float]) -> list[float]:
+    """
+    Эталон для строки compatibility_matrix: критерии по парам COMPATIBILITY_PAIRS по одному.
+    """
+    scores = []
+    for planet1, planet2 in COMPATIBILITY_PAIRS.values():
+        angle = abs(first[PLANET_NAMES.index(planet1)] - second[PLANET_NAMES.index(planet2)])
+        angle = min(angle, 360 - angle)
+        scores.append(max(0, min(aspect_score_reference(angle), 100)))
+    return scores
+
+
+def edge_angles() -> np.ndarray:
+    """
+    Углы на границах орбисов ASPECT_RANGES: точно на границе и на 1e-9 по обе стороны.
+    """
+    edges = [edge for (low, high), _, _ in ASPECT_RANGES for edge in (low, high)]
+    return np.array([edge + shift for edge in edges for shift in (-1e-9, 0.0, 1e-9)])
+
+
+def edge_longitudes() -> np.ndarray:
+    """
+    Пары долгот (строки 2k и 2k + 1, все планеты одинаковы) с углами edge_angles,
+    в том числе через переход 360 -> 0.
+    """
+    rows = []
+    for base in (0.0, 0.25, 179.5, 359.75, 360 - 1e-9):
+        for angle in edge_angles():
+            for sign in (1, -1):
+                rows += [base, (base + sign * angle) % 360]
+    return np.repeat(np.array(rows)[:, None], len(PLANET_NAMES), axis=1)
+
+
+def test_matrix_matches_reference() -> None:
+    longitudes = np.random.default_rng(0).uniform(0, 360, (200, len(PLANET_NAMES)))
+    matrix = compatibility_matrix(longitudes)
+    mismatches = [
+        (i, j)
+        for i in range(len(longitudes))
+        for j in range(len(longitudes))
+        if matrix[i, j].tolist() != compatibility_reference(longitudes[i], longitudes[j])
+    ]
+    assert mismatches == []
+
+
+def test_matrix_on_orb_edges() -> None:
+    edges = edge_longitudes()
+    first, second = edges[0::2], edges[1::2]
+    matrix = compatibility_matrix(first, second)
+    mismatches = [
+        k
+        for k in range(len(first))
+        if matrix[k, k].tolist() != compatibility_reference(first[k], second[k])
+    ]
+    assert mismatches == []
+
+
+@pytest.mark.parametrize(
+    "angles",
+    [
+        pytest.param(np.random.default_rng(0).uniform(0, 180, 100_000), id="random"),
+        pytest.param(np.clip(edge_angles(), 0, 180), id="edges"),
+    ],
+)
+def test_aspect_indices_match_ranges(angles: np.ndarray) -> None:
+    # Окна aspect_indices совпадают с ASPECT_RANGES
+    names = [ASPECT_NAMES[index] if index >= 0 else None for index in aspect_indices(angles)]
+    expected = [
+        next((name for (low, high), name, _ in ASPECT_RANGES if low <= angle <= high), None)
+        for angle in angles.tolist()
+    ]
+    assert names == expected
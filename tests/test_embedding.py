@@ -0,0 +1,51 @@
+import numpy as np
+
+from tests.test_astrology import SNAPSHOT
+from zodiac.services.astrology import PLANET_NAMES, PLANET_PAIRS, AstroChart
+from zodiac.services.compatibility import ASPECT_ANGLES, ASPECT_NAMES
+from zodiac.services.embedding import (
+    ASPECTS_SLICE,
+    EMBEDDING_DIMENSION,
+    NODE_SLICE,
+    PLANETS_SLICE,
+    encode_charts,
+    encode_longitudes,
+)
+
+
+def test_encode_charts_layout() -> None:
+    chart = AstroChart.from_snapshot(SNAPSHOT)
+    embeddings = encode_charts([chart, chart])
+    assert embeddings.shape == (2, EMBEDDING_DIMENSION)
+    assert embeddings.dtype == np.float32
+    assert embeddings.flags.c_contiguous
+
+    [embedding] = encode_charts([chart])
+    planets = embedding[PLANETS_SLICE].reshape(len(PLANET_NAMES), 2)
+    radians = np.radians(SNAPSHOT.longitudes)
+    np.testing.assert_allclose(planets, np.stack([np.cos(radians), np.sin(radians)], axis=-1))
+    node = np.radians(SNAPSHOT.lunar_node)
+    np.testing.assert_allclose(embedding[NODE_SLICE], [np.cos(node), np.sin(node)], rtol=1e-6)
+
+    # One-hot аспектов совпадает с аспектами карты
+    aspects = embedding[ASPECTS_SLICE].reshape(len(PLANET_PAIRS), len(ASPECT_ANGLES))
+    expected = {
+        (PLANET_NAMES.index(aspect.planet1.lower()), PLANET_NAMES.index(aspect.planet2.lower())): (
+            ASPECT_NAMES.index(aspect.aspect)
+        )
+        for aspect in chart.aspects
+    }
+    found = {PLANET_PAIRS[pair]: index for pair, index in zip(*np.nonzero(aspects), strict=True)}
+    assert found == expected
+
+
+def test_encode_longitudes_wraps_at_360() -> None:
+    longitudes = np.full((2, len(PLANET_NAMES)), 359.9)
+    longitudes[1] = 0.1
+    first, second = encode_longitudes(longitudes)
+    # Долготы по разные стороны 0° дают близкие координаты
+    np.testing.assert_allclose(first[PLANETS_SLICE], second[PLANETS_SLICE], atol=0.005)
+
+
+def test_encode_empty_batch() -> None:
+    assert encode_charts([]).shape == (0, EMBEDDING_DIMENSION)
@@ -0,0 +1,40 @@
+import math
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from zodiac.config import OPTIMIZER_BALANCE_WEIGHT, OPTIMIZER_EXHAUSTIVE_LIMIT
+from zodiac.services.team_optimizer import TeamOptimizer
+from zodiac.services.traits import TRAIT_FIELDS
+
+
+def random_pool(count: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Симметричная матрица совместимости без диагонали и личные качества count кандидатов.
+    """
+    rng = np.random.default_rng(seed)
+    scores = rng.uniform(0, 100, (count, count))
+    scores = (scores + scores.T) / 2
+    np.fill_diagonal(scores, 0)
+    traits = rng.dirichlet(np.ones(len(TRAIT_FIELDS)), count) * 100
+    return scores, traits
+
+
+# Полный перебор и подбор для пулов чуть больше команды
+@pytest.mark.parametrize(
+    ("count", "size"), [(12, 3), (12, 9), (14, 7), (30, 26), (30, 29), (30, 30), (1000, 999)]
+)
+def test_optimize(count: int, size: int) -> None:
+    scores, traits = random_pool(count)
+    optimizer = TeamOptimizer(scores, traits, OPTIMIZER_BALANCE_WEIGHT)
+    selection = optimizer.optimize(size, time_budget=0.2)
+    assert len(set(selection.members)) == size
+    if math.comb(count, size) <= OPTIMIZER_EXHAUSTIVE_LIMIT:
+        # Эталон: прямой перебор всех команд
+        reference = max(
+            optimizer.selection(list(members)).objective
+            for members in combinations(range(count), size)
+        )
+        assert math.isclose(selection.objective, reference, rel_tol=1e-9)
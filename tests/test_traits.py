@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from zodiac.entities.dto.astro import ASPECTS, AspectName, ChartSnapshot, PersonalTraits
+from zodiac.services.astrology import AstroChart, Planet, adjusted_aspect_score
+from zodiac.services.traits import TRAIT_FIELDS, personal_traits, personal_traits_matrix
+
+
+# Прежние правила AstroChart.calculate_personal_traits — намеренно отдельная копия
+# TRAIT_RULES: правка таблиц в traits, меняющая сохранённые качества, видна в тестах
+REFERENCE_INFLUENCES = {
+    Planet.SUN: [("leadership", ["Овен", "Лев", "Стрелец"], [1, 10])],
+    Planet.MARS: [("leadership", ["Овен", "Скорпион"], [1, 11])],
+    Planet.SATURN: [
+        ("stress_resilience", ["Телец", "Дева", "Козерог"], [6, 10]),
+        ("responsibility", ["Козерог", "Дева"], [6, 10]),
+    ],
+    Planet.MERCURY: [("communication", ["Близнецы", "Весы", "Водолей"], [3, 7])],
+    Planet.VENUS: [("communication", ["Близнецы", "Весы"], [3, 7])],
+    Planet.JUPITER: [("ambition", ["Стрелец", "Лев"], [9, 10])],
+    Planet.PLUTO: [("ambition", ["Скорпион", "Козерог"], [8, 10])],
+}
+
+
+def influence_score_reference(
+    chart: AstroChart,
+    planet: Planet,
+    signs: list[str],
+    houses: list[int],
+    aspects: list[tuple[Planet, Planet, int, float]],
+) -> float:
+    """
+    Эталон: прежний AstroChart.influence_score.
+    """
+    score = 0
+    degree = float(chart.degrees[planet])
+    if chart.get_zodiac_sign(degree) in signs:
+        score += 10
+    if chart.get_house(degree) in houses:
+        score += 10
+    for first, second, index, angle in aspects:
+        if planet in {first, second}:
+            score += adjusted_aspect_score(index, angle) / 10
+    elements_score = {"Огонь": 5, "Земля": 3, "Воздух": 4, "Вода": 2}
+    return score + elements_score[chart.get_zodiac_element(degree)]
+
+
+def personal_traits_reference(chart: AstroChart) -> PersonalTraits:
+    """
+    Эталон для personal_traits_matrix: прежний построчный AstroChart.calculate_personal_traits.
+    """
+    traits = dict.fromkeys(TRAIT_FIELDS, 0.0)
+    aspects = chart.planet_aspects()
+    for planet, influences in REFERENCE_INFLUENCES.items():
+        for trait, signs, houses in influences:
+            traits[trait] += influence_score_reference(chart, planet, signs, houses, aspects)
+
+    for first, second, index, _ in aspects:
+        aspect = ASPECTS[index]["name"]
+        if aspect in {AspectName.TRIN, AspectName.SOEDINENIE}:
+            if Planet.SUN in {first, second}:
+                traits["leadership"] += 5
+            if Planet.MERCURY in {first, second}:
+                traits["communication"] += 5
+            if Planet.MARS in {first, second}:
+                traits["ambition"] += 5
+        if aspect == AspectName.KVADRATURA:
+            traits["stress_resilience"] = max(0, traits["stress_resilience"] - 5)
+
+    total = sum(traits.values())
+    if total > 0:
+        traits = {trait: (value / total) * 100 for trait, value in traits.items()}
+    return PersonalTraits(**traits)
+
+
+def reference_charts(count: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Долготы и асценденты count случайных карт; половина округлена до градусов, чтобы
+    планеты и асцендент попадали точно на границы знаков, домов и орбисов.
+    """
+    rng = np.random.default_rng(seed)
+    longitudes = rng.uniform(0, 360, (count, len(Planet)))
+    ascendants = rng.uniform(0, 360, count)
+    half = count // 2
+    longitudes[:half] = np.round(longitudes[:half]) % 360
+    ascendants[:half] = np.round(ascendants[:half]) % 360
+    return longitudes, ascendants
+
+
+def make_chart(degrees: np.ndarray, ascendant: float) -> AstroChart:
+    snapshot = ChartSnapshot.model_validate({
+        "birth_time": "2000-01-01T00:00:00",
+        "latitude": 0.0,
+        "longitude": 0.0,
+        "ascendant": float(ascendant),
+        "longitudes": degrees.tolist(),
+        "lunar_node": 0.0,
+    })
+    return AstroChart.from_snapshot(snapshot)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matrix_matches_reference(seed: int) -> None:
+    longitudes, ascendants = reference_charts(5_000, seed)
+    matrix = personal_traits_matrix(longitudes, ascendants)
+    mismatches = []
+    for i, (row, degrees, ascendant) in enumerate(zip(matrix, longitudes, ascendants)):
+        expected = personal_traits_reference(make_chart(degrees, ascendant)).model_dump()
+        if row.tolist() != [expected[field] for field in TRAIT_FIELDS]:
+            mismatches.append(i)
+    assert mismatches == []
+
+
+def test_personal_traits_per_chart() -> None:
+    longitudes, ascendants = reference_charts(10, seed=42)
+    charts = [make_chart(degrees, ascendant) for degrees, ascendant in zip(longitudes, ascendants)]
+    assert personal_traits(charts) == [personal_traits_reference(chart) for chart in charts]
+    assert personal_traits([]) == []
@@ -3,13 +3,15 @@ from typing import Optional
 
 import jwt
 
+from beanie.operators import Set
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from passlib.hash import bcrypt
 from pydantic import BaseModel, EmailStr
 
-from zodiac.config import JWT_ALGORITHM, JWT_SECRET_KEY
 from zodiac.entities.db.user import User
+from zodiac.services.passwords import password_hasher
+from zodiac.services.signing_keys import signing_keys
+from zodiac.services.users import user_cache
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
@@ -25,14 +27,22 @@ class AuthResponse(BaseModel):
 
 async def authenticate_user(email: str, password: str) -> Optional[User]:
     user = await User.find_one(User.email == email)
-    if user and bcrypt.verify(password, user.password):
-        return user
-    return None
+    if not user:
+        return None
+    verified, new_hash = await password_hasher.verify(password, user.password)
+    if not verified:
+        return None
+    if new_hash:
+        # Хэш посчитан с прежней стоимостью BCRYPT_ROUNDS — заменяем на актуальный
+        user.password = new_hash
+        await User.find_one(User.id == user.id).update(Set({User.password: new_hash}))
+        user_cache.invalidate(str(user.id))
+    return user
 
 def create_access_token(user_id: str) -> str:
     expire = datetime.now(UTC) + timedelta(days=7)
     to_encode = {"exp": expire, "sub": user_id}
-    return jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    return signing_keys.encode(to_encode)
 
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     credentials_exception = HTTPException(
@@ -40,13 +50,13 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
         detail="Could not validate credentials",
     )
     try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        payload = signing_keys.decode(token)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
     except jwt.PyJWTError:
         raise credentials_exception
-    user = await User.get(user_id)
+    user = await user_cache.get(user_id)
     if user is None:
         raise credentials_exception
     return user
@@ -0,0 +1,27 @@
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse для генераторов, которые сами читают тело запроса.
+
+    Обычный StreamingResponse параллельно ждёт http.disconnect через receive() и
+    забирает себе сообщения с телом запроса. Здесь receive остаётся генератору,
+    а отключение клиента он получает как ClientDisconnect из request.stream().
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Совпадает ли ETag с заголовком If-None-Match (слабое сравнение, как требует RFC 9110).
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in tags
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
-from passlib.hash import bcrypt
+from beanie import PydanticObjectId
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
 from zodiac.api.auth import (
     AuthRequest,
@@ -8,6 +8,7 @@ from zodiac.api.auth import (
     create_access_token,
     get_current_user,
 )
+from zodiac.api.responses import RequestStreamingResponse, etag_matches
 from zodiac.entities.db.employee import Employee
 from zodiac.entities.db.team import Team
 from zodiac.entities.db.user import User
@@ -16,16 +17,45 @@ from zodiac.entities.dto.auth import (
     UserCreateRequest,
     UserCreateResponse,
 )
+from zodiac.entities.dto.health import MetricsResponse, ReadinessResponse
 from zodiac.entities.dto.member import (
     AddMemberRequest,
     AddMemberResponse,
     GetMemberResponse,
     MemberDto,
+    RemoveMemberResponse,
+)
+from zodiac.entities.dto.team import (
+    CandidateDto,
+    OptimizeTeamRequest,
+    OptimizeTeamResponse,
+    TeamCandidatesResponse,
+    TeamCreateRequest,
+    TeamCreateResponse,
+    TeamDto,
+    TeamGetResponse,
+    TeamMembersResponse,
 )
-from zodiac.entities.dto.team import TeamCreateRequest, TeamCreateResponse, TeamDto, TeamGetResponse
 from zodiac.entities.enums.roles import Role
-from zodiac.services.astrology import AstroChart
+from zodiac.services import team_compatibility
+from zodiac.services.astrology import BirthData
+from zodiac.services.candidates import candidate_search
+from zodiac.services.chart_cache import chart_cache
+from zodiac.services.ephemeris import ephemeris
+from zodiac.services.executor import chart_executor
 from zodiac.services.geo import get_coordinates_by_city_name
+from zodiac.services.importer import ImportFormat, import_members
+from zodiac.services.pagination import NEXT_CURSOR_HEADER, Cursor
+from zodiac.services.passwords import password_hasher
+from zodiac.services.projections import (
+    get_member_with_team_charts,
+    list_team_members,
+    list_team_summaries,
+)
+from zodiac.services.team_optimizer import optimize_team
+from zodiac.services.team_view import team_cache_headers, team_etag, team_views
+from zodiac.services.traits import personal_traits
+from zodiac.services.users import user_cache
 
 
 auth_router = APIRouter(prefix="/auth", tags=["Auth"])
@@ -38,7 +68,7 @@ async def register(data: UserCreateRequest) -> UserCreateResponse:
         raise HTTPException(status_code=400, detail="Email already registered")
     user = User(
         email=data.email,
-        password=bcrypt.hash(data.password),
+        password=await password_hasher.hash(data.password),
         full_name=data.full_name,
     )
     await user.insert()
@@ -70,13 +100,55 @@ async def create_team(
     return TeamCreateResponse(success=True, id=str(team.id), message="Team created successfully")
 
 
+@teams_router.post("/optimize", response_model=OptimizeTeamResponse)
+async def optimize_team_composition(
+    data: OptimizeTeamRequest, current_user: User = Depends(get_current_user)
+) -> OptimizeTeamResponse:
+    """
+    Подбор команды из data.size заявителей с наибольшей взаимной совместимостью
+    и сбалансированными личными качествами.
+    """
+    team = await optimize_team(data.size, data.team_id, data.time_budget, data.balance_weight)
+    if team is None:
+        return OptimizeTeamResponse(success=False, message="Not enough applicants in the pool")
+    return OptimizeTeamResponse(
+        success=True,
+        members=[
+            CandidateDto(
+                id=str(member.id),
+                full_name=member.full_name,
+                position=member.position,
+                role=member.role,
+                team_id=str(member.team.ref.id) if member.team else None,
+                compatibility=compatibility,
+            )
+            for member, compatibility in zip(team.members, team.compatibilities)
+        ],
+        mean_score=team.selection.mean_score,
+        balance=team.selection.balance,
+        traits=team.traits,
+        pool_size=team.pool_size,
+        exhaustive=team.selection.exhaustive,
+    )
+
+
 @teams_router.get("", response_model=list[TeamDto])
 async def list_teams(
+    response: Response,
     limit: int = 30,
+    cursor: str | None = None,
     offset: int = 0,
     current_user: User = Depends(get_current_user),
 ) -> list[TeamDto]:
-    teams = await Team.find({}, fetch_links=True, limit=limit, skip=offset).to_list()
+    """
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor
+    (нет заголовка — страница последняя).
+    """
+    teams, next_cursor = await list_team_summaries(
+        limit, Cursor.decode(cursor) if cursor else None, offset
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return [
         TeamDto(
             id=str(team.id),
@@ -84,57 +156,104 @@ async def list_teams(
             description=team.description,
             employees=[],
             applicants=[],
+            employees_count=team.employees_count,
+            applicants_count=team.applicants_count,
         )
         for team in teams
     ]
 
 
 @teams_router.get("/{team_id}", response_model=TeamGetResponse)
-async def get_team(team_id: str, current_user: User = Depends(get_current_user)) -> TeamGetResponse:
-    team = await Team.get(team_id, fetch_links=True)
-    if not team:
+async def get_team(
+    team_id: str,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+) -> TeamGetResponse | Response:
+    """
+    Ответ помечается ETag по версии команды; при совпадении If-None-Match — 304 без тела.
+    """
+    version = await team_views.version(team_id)
+    if version is None:
         return TeamGetResponse(success=False)
-    team_members = team.employees or []
-    astro_charts = {}
-    for member in team_members:
-        astro_chart = AstroChart(
-            birth_time=member.birth_date,
-            latitude=member.birth_place.latitude,
-            longitude=member.birth_place.longitude,
-        )
-        astro_charts[str(member.id)] = astro_chart
-    employees = []
-    applicants = []
-    for member in team_members:
-        member_id = str(member.id)
-        other_charts = [chart for mid, chart in astro_charts.items() if mid != member_id]
-        compatibility = astro_charts[member_id].calculate_group_compatibility(other_charts)
-        data = MemberDto(
-            id=member_id,
-            full_name=member.full_name,
-            birth_date=member.birth_date,
-            birth_place=member.birth_place,
-            email=member.email,
-            phone=member.phone,
-            position=member.position,
-            astro=AstroShit(
-                personal_traits=member.personal_traits,
-                compatibility=compatibility,
-            ),
+    if etag_matches(request.headers.get("if-none-match"), team_etag(team_id, version)):
+        return Response(status_code=304, headers=team_cache_headers(team_id, version))
+    view = await team_views.get(team_id, version)
+    if view is None:
+        return TeamGetResponse(success=False)
+    version, team = view
+    response.headers.update(team_cache_headers(team_id, version))
+    return team
+
+
+@teams_router.get("/{team_id}/members", response_model=TeamMembersResponse)
+async def list_members(
+    team_id: str,
+    role: Role = Role.EMPLOYEE,
+    limit: int = 30,
+    cursor: str | None = None,
+    current_user: User = Depends(get_current_user),
+) -> TeamMembersResponse:
+    team = await Team.get(team_id)
+    if not team:
+        return TeamMembersResponse(success=False)
+    members, next_cursor = await list_team_members(
+        team.id, role, limit, Cursor.decode(cursor) if cursor else None
+    )
+    # Заявители входят в суммы совместимости наравне с сотрудниками
+    others = len(team.compatibility) - 1
+    compatibilities = {
+        str(member.id): team_compatibility.average_compatibility(
+            team.compatibility[str(member.id)], others
         )
-        if member.role == Role.EMPLOYEE:
-            employees.append(data)
-        elif member.role == Role.PENDING:
-            applicants.append(data)
-    return TeamGetResponse(
+        for member in members
+        if str(member.id) in team.compatibility
+    }
+    return TeamMembersResponse(
         success=True,
-        team=TeamDto(
-            id=str(team.id),
-            name=team.name,
-            description=team.description,
-            employees=employees,
-            applicants=applicants,
-        ),
+        members=[
+            MemberDto(
+                id=str(member.id),
+                full_name=member.full_name,
+                birth_date=member.birth_date,
+                birth_place=member.birth_place,
+                email=member.email,
+                phone=member.phone,
+                position=member.position,
+                astro=AstroShit(
+                    personal_traits=member.personal_traits,
+                    compatibility=compatibilities.get(str(member.id)),
+                ),
+            )
+            for member in members
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+@teams_router.get("/{team_id}/candidates", response_model=TeamCandidatesResponse)
+async def get_team_candidates(
+    team_id: str,
+    limit: int = 10,
+    current_user: User = Depends(get_current_user),
+) -> TeamCandidatesResponse:
+    team = await Team.get(team_id)
+    if not team:
+        return TeamCandidatesResponse(success=False)
+    matches = await candidate_search.search(team, limit)
+    return TeamCandidatesResponse(
+        success=True,
+        candidates=[
+            CandidateDto(
+                id=str(candidate.id),
+                full_name=candidate.full_name,
+                position=candidate.position,
+                role=candidate.role,
+                team_id=str(candidate.team.ref.id) if candidate.team else None,
+                compatibility=compatibility,
+            )
+            for candidate, compatibility in matches
+        ],
     )
 
 
@@ -150,13 +269,15 @@ async def add_employee(
     team = await Team.get(team_id)
     if not team:
         return AddMemberResponse(success=False, message="Team not found")
-    place = data.birth_place.name
-    data.birth_place.latitude, data.birth_place.longitude = get_coordinates_by_city_name(place)
+    coordinates = await get_coordinates_by_city_name(data.birth_place.name)
+    data.birth_place.latitude, data.birth_place.longitude = coordinates
 
-    astro_chart = AstroChart(
-        birth_time=data.birth_date,
-        latitude=data.birth_place.latitude,
-        longitude=data.birth_place.longitude,
+    astro_chart = await chart_cache.build(
+        BirthData(
+            birth_time=data.birth_date,
+            latitude=data.birth_place.latitude,
+            longitude=data.birth_place.longitude,
+        )
     )
     employee = Employee(
         full_name=data.full_name,
@@ -165,34 +286,66 @@ async def add_employee(
         email=data.email,
         phone=data.phone,
         position=data.position,
-        personal_traits=astro_chart.calculate_personal_traits(),
+        personal_traits=personal_traits([astro_chart])[0],
+        chart=astro_chart.to_snapshot(),
         role=data.role,
         team=team,
     )
     await employee.insert()
-    team.employees.append(employee)
-    await team.save()
+    await candidate_search.add([employee], [astro_chart])
+    await team_compatibility.add_member(team, str(employee.id), astro_chart)
     return AddMemberResponse(success=True, message="Employee added successfully")
 
 
+@members_router.post("/{team_id}/import", response_model=None)
+async def import_employees(
+    team_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+) -> AddMemberResponse | RequestStreamingResponse:
+    """
+    Импорт участников из CSV (Content-Type: text/csv) или NDJSON.
+    В ответ потоком (NDJSON) приходит прогресс импорта.
+    """
+    team = await Team.get(team_id)
+    if not team:
+        return AddMemberResponse(success=False, message="Team not found")
+    progress = import_members(
+        team,
+        request.stream(),
+        ImportFormat.from_content_type(request.headers.get("content-type", "")),
+    )
+    return RequestStreamingResponse(
+        (f"{state.model_dump_json(by_alias=True)}\n" async for state in progress),
+        media_type="application/x-ndjson",
+    )
+
+
+@members_router.delete("/{member_id}", response_model=RemoveMemberResponse)
+async def remove_employee(
+    member_id: str,
+    current_user: User = Depends(get_current_user),
+) -> RemoveMemberResponse:
+    member = await Employee.get(member_id)
+    if not member:
+        return RemoveMemberResponse(success=False, message="Member not found")
+    # Версия команды увеличивается уже после удаления, см. TeamViewCache
+    await member.delete()
+    if member.team:
+        chart = await chart_cache.get(member)
+        await team_compatibility.remove_member(member.team.ref.id, member_id, chart)
+    await candidate_search.remove([member_id])
+    return RemoveMemberResponse(success=True, message="Member removed successfully")
+
+
 @members_router.get("/{member_id}", response_model=GetMemberResponse)
 async def get_member(member_id: str, current_user: User = Depends(get_current_user)):
-    member = await Employee.get(member_id, fetch_links=True, with_children=True, nesting_depth=2)
-    if not member:
+    found = await get_member_with_team_charts(PydanticObjectId(member_id))
+    if not found:
         return GetMemberResponse(success=False)
-    chart = AstroChart(
-        birth_time=member.birth_date,
-        latitude=member.birth_place.latitude,
-        longitude=member.birth_place.longitude,
-    )
-    team_compatibility = chart.calculate_group_compatibility([
-        AstroChart(
-            birth_time=employee.birth_date,
-            latitude=employee.birth_place.latitude,
-            longitude=employee.birth_place.longitude,
-        )
-        for employee in member.team.employees
-    ])
+    member, team = found
+    chart, *team_charts = await chart_cache.get_many([member, *team])
+    team_compatibility = chart.calculate_group_compatibility(team_charts)
     return GetMemberResponse(
         success=True,
         member=MemberDto(
@@ -211,3 +364,29 @@ async def get_member(member_id: str, current_user: User = Depends(get_current_us
             ),
         ),
     )
+
+
+health_router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@health_router.get("/live")
+async def live() -> dict[str, str]:
+    return {"status": "ok"}
+
+
+@health_router.get("/ready")
+async def ready(response: Response) -> ReadinessResponse:
+    is_ready = ephemeris.ready and chart_executor.ready
+    if not is_ready:
+        response.status_code = 503
+    return ReadinessResponse(
+        ready=is_ready,
+        ephemeris=ephemeris.ephemeris,
+        ephemeris_grid=ephemeris.grid is not None,
+        chart_workers=chart_executor.workers,
+    )
+
+
+@health_router.get("/metrics")
+async def metrics() -> MetricsResponse:
+    return MetricsResponse(user_cache=user_cache.metrics())
@@ -1,13 +1,20 @@
+import asyncio
+
 from beanie import init_beanie
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 
-from zodiac.api.routes import auth_router, members_router, teams_router
+from zodiac.api.routes import auth_router, health_router, members_router, teams_router
 from zodiac.config import MONGO_URL
+from zodiac.entities.db.city import City
 from zodiac.entities.db.employee import Employee
 from zodiac.entities.db.team import Team
 from zodiac.entities.db.user import User
+from zodiac.services.ephemeris import ephemeris
+from zodiac.services.executor import chart_executor
+from zodiac.services.pagination import NEXT_CURSOR_HEADER
+from zodiac.services.passwords import password_hasher
 
 
 app = FastAPI(title="Astro API", version="0.0.1")
@@ -22,6 +29,7 @@ app.add_middleware(
     ],
     allow_credentials=True,
     allow_methods=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
     allow_headers=["*"],
 )
 
@@ -29,6 +37,7 @@ app.add_middleware(
 app.include_router(auth_router, prefix="/api/v1")
 app.include_router(teams_router, prefix="/api/v1")
 app.include_router(members_router, prefix="/api/v1")
+app.include_router(health_router, prefix="/api/v1")
 
 
 @app.on_event("startup")
@@ -36,5 +45,13 @@ async def startup_event():
     client = AsyncIOMotorClient(MONGO_URL)
     await init_beanie(
         database=client.zodiac,
-        document_models=[User, Employee, Team],
+        document_models=[User, Employee, Team, City],
     )
+    await asyncio.to_thread(ephemeris.warm_up)
+    await chart_executor.warm_up()
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    chart_executor.shutdown()
+    password_hasher.shutdown()
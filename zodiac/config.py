@@ -1,10 +1,58 @@
-from secrets import token_urlsafe
-
 from envparse import env
 
 
 env.read_envfile()
 
-JWT_SECRET_KEY = token_urlsafe(32)
+# "kid:secret" через запятую (или по строке в JWT_KEYS_FILE); подписывает
+# JWT_ACTIVE_KEY, по умолчанию первый ключ
+JWT_KEYS = env.str("JWT_KEYS", default="")
+JWT_KEYS_FILE = env.str("JWT_KEYS_FILE", default="")
+JWT_ACTIVE_KEY = env.str("JWT_ACTIVE_KEY", default="")
 JWT_ALGORITHM = "HS256"
 MONGO_URL = env.str("MONGO_URL")
+
+BCRYPT_ROUNDS = env.int("BCRYPT_ROUNDS", default=12)
+PASSWORD_HASH_WORKERS = env.int("PASSWORD_HASH_WORKERS", default=2)
+PASSWORD_HASH_MAX_QUEUE = env.int("PASSWORD_HASH_MAX_QUEUE", default=64)
+USER_CACHE_SIZE = env.int("USER_CACHE_SIZE", default=10_000)
+USER_CACHE_TTL = env.float("USER_CACHE_TTL", default=30.0)
+USER_CACHE_SINGLE_FLIGHT = env.bool("USER_CACHE_SINGLE_FLIGHT", default=True)
+
+EPHEMERIS = env.str("EPHEMERIS", default="jpl")
+IERS_AUTO_DOWNLOAD = env.bool("IERS_AUTO_DOWNLOAD", default=False)
+# Сетка долгот планет (.npy, строится python -m zodiac.services.ephemeris_grid_builder);
+# пусто — долготы считаются astropy
+EPHEMERIS_GRID_PATH = env.str("EPHEMERIS_GRID_PATH", default="")
+EPHEMERIS_GRID_START = env.str("EPHEMERIS_GRID_START", default="1940-01-01")
+EPHEMERIS_GRID_END = env.str("EPHEMERIS_GRID_END", default="2016-01-01")
+EPHEMERIS_GRID_STEP = env.float("EPHEMERIS_GRID_STEP", default=6.0)  # Часы
+EPHEMERIS_GRID_MAX_ERROR = env.float("EPHEMERIS_GRID_MAX_ERROR", default=5.0)  # Угловые секунды
+
+CHART_CACHE_SIZE = env.int("CHART_CACHE_SIZE", default=10_000)
+CHART_WORKERS = env.int("CHART_WORKERS", default=2)
+CHART_MAX_CONCURRENCY = env.int("CHART_MAX_CONCURRENCY", default=4)
+CHART_MAX_QUEUE = env.int("CHART_MAX_QUEUE", default=64)
+
+COMPATIBILITY_HARMONICS = env.int("COMPATIBILITY_HARMONICS", default=32)
+# numpy, hnsw (нужен extra hnsw: uv sync --extra hnsw) или qdrant
+VECTOR_INDEX = env.str("VECTOR_INDEX", default="numpy")
+QDRANT_URL = env.str("QDRANT_URL", default="http://localhost:6333")
+QDRANT_COLLECTION = env.str("QDRANT_COLLECTION", default="astro_profiles")
+CANDIDATE_OVERSAMPLE = env.int("CANDIDATE_OVERSAMPLE", default=5)
+CANDIDATE_SYNC_INTERVAL = env.float("CANDIDATE_SYNC_INTERVAL", default=5.0)
+
+OPTIMIZER_MAX_POOL = env.int("OPTIMIZER_MAX_POOL", default=1000)
+OPTIMIZER_TIME_BUDGET = env.float("OPTIMIZER_TIME_BUDGET", default=1.0)
+OPTIMIZER_MAX_TIME_BUDGET = env.float("OPTIMIZER_MAX_TIME_BUDGET", default=10.0)
+OPTIMIZER_BALANCE_WEIGHT = env.float("OPTIMIZER_BALANCE_WEIGHT", default=0.25)
+OPTIMIZER_EXHAUSTIVE_LIMIT = env.int("OPTIMIZER_EXHAUSTIVE_LIMIT", default=20_000)
+
+PAGE_SIZE_LIMIT = env.int("PAGE_SIZE_LIMIT", default=100)
+TEAM_VIEW_CACHE_SIZE = env.int("TEAM_VIEW_CACHE_SIZE", default=1000)
+
+GEO_CACHE_SIZE = env.int("GEO_CACHE_SIZE", default=10_000)
+GAZETTEER_PATH = env.str("GAZETTEER_PATH", default="")
+GEOCODER_MIN_DELAY = env.float("GEOCODER_MIN_DELAY", default=1.0)
+
+IMPORT_BATCH_SIZE = env.int("IMPORT_BATCH_SIZE", default=500)
+IMPORT_MAX_ERRORS = env.int("IMPORT_MAX_ERRORS", default=100)
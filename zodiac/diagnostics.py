@@ -0,0 +1,105 @@
+"""
+Проверка планов горячих запросов: python -m zodiac.diagnostics
+
+Создаёт объявленные в моделях индексы (через init_beanie), выполняет explain для
+каждого запроса из HOT_QUERIES и отмечает планы с полным сканированием коллекции
+(COLLSCAN). Код возврата 1, если такие нашлись.
+"""
+
+import asyncio
+import sys
+
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+
+from beanie import PydanticObjectId, init_beanie
+from beanie.odm.queries.find import FindMany
+from beanie.operators import GTE
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from zodiac.config import MONGO_URL, OPTIMIZER_MAX_POOL
+from zodiac.entities.db.city import City
+from zodiac.entities.db.employee import Employee
+from zodiac.entities.db.team import Team
+from zodiac.entities.db.user import User
+from zodiac.entities.enums.roles import Role
+from zodiac.services.pagination import Cursor
+
+
+DOCUMENT_MODELS = [User, Employee, Team, City]
+
+# Значения в запросах не важны для плана, важна только форма фильтра и сортировки
+_ID = PydanticObjectId()
+
+HOT_QUERIES: dict[str, Callable[[], FindMany]] = {
+    "user by email": lambda: User.find(User.email == "user@example.com"),
+    "city by name": lambda: City.find(City.name == "moscow"),
+    "team page": lambda: (
+        Team.find(Cursor(datetime.now(UTC), _ID).after()).sort(+Team.created_at, +Team.id).limit(31)
+    ),
+    "team members": lambda: Employee.find(Employee.team.id == _ID),
+    "team members by role": lambda: Employee.find(
+        Employee.team.id == _ID, Employee.role == Role.PENDING
+    ),
+    "team members page": lambda: (
+        Employee
+        .find(Employee.team.id == _ID, Employee.role == Role.EMPLOYEE)
+        .find(Cursor(datetime.now(UTC), _ID).after())
+        .sort(+Employee.created_at, +Employee.id)
+        .limit(31)
+    ),
+    "applicant pool": lambda: (
+        Employee
+        .find(Employee.role == Role.PENDING)
+        .sort(-Employee.created_at)
+        .limit(OPTIMIZER_MAX_POOL)
+    ),
+    "new employees": lambda: Employee.find(GTE(Employee.created_at, datetime.now(UTC))),
+}
+
+
+def plan_stages(plan: dict | list) -> Iterator[str]:
+    """
+    Все стадии плана explain, включая вложенные (inputStage, inputStages, queryPlan...).
+    """
+    if isinstance(plan, list):
+        for item in plan:
+            yield from plan_stages(item)
+        return
+    if "stage" in plan:
+        yield plan["stage"]
+    for value in plan.values():
+        if isinstance(value, dict | list):
+            yield from plan_stages(value)
+
+
+async def explain(query: FindMany) -> dict:
+    cursor = query.document_model.get_motor_collection().find(
+        query.get_filter_query(),
+        sort=query.sort_expressions or None,
+        skip=query.skip_number,
+        limit=query.limit_number,
+    )
+    return await cursor.explain()
+
+
+async def main() -> int:
+    client = AsyncIOMotorClient(MONGO_URL)
+    await init_beanie(database=client.zodiac, document_models=DOCUMENT_MODELS)
+
+    collection_scans = 0
+    for name, build_query in HOT_QUERIES.items():
+        plan = await explain(build_query())
+        stages = list(plan_stages(plan["queryPlanner"]["winningPlan"]))
+        status = "COLLSCAN" if "COLLSCAN" in stages else "ok"
+        collection_scans += status != "ok"
+        print(f"{status:<9} {name:<22} {' <- '.join(stages)}")
+
+    for model in DOCUMENT_MODELS:
+        indexes = await model.get_motor_collection().index_information()
+        print(f"{model.get_collection_name()}: {', '.join(sorted(indexes))}")
+    return 1 if collection_scans else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,18 @@
+from datetime import UTC, datetime
+from typing import ClassVar
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+class City(Document):
+    name: str  # Нормализованное название, см. services.geo.normalize_city_name
+    latitude: float
+    longitude: float
+    source: str
+
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+    class Settings:
+        indexes: ClassVar[list[IndexModel]] = [IndexModel([("name", ASCENDING)], unique=True)]
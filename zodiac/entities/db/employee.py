@@ -1,10 +1,12 @@
 from datetime import UTC, datetime
+from typing import ClassVar
 
-from beanie import Document, Link
-from pydantic import Field
+from beanie import Document, Link, PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from zodiac.entities.db.team import Team
-from zodiac.entities.dto.astro import PersonalTraits
+from zodiac.entities.dto.astro import ChartSnapshot, PersonalTraits
 from zodiac.entities.dto.location import Location
 from zodiac.entities.enums.roles import Role
 
@@ -18,7 +20,35 @@ class Employee(Document):
     phone: str
     position: str
     personal_traits: PersonalTraits
+    chart: ChartSnapshot | None = None
     team: Link[Team] | None = None
     role: Role = Role.PENDING
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+    class Settings:
+        indexes: ClassVar[list[IndexModel]] = [
+            # Участники команды (ссылка хранится как DBRef) и их роли; хвост
+            # (created_at, _id) — для постраничного списка участников
+            IndexModel([
+                ("team.$id", ASCENDING),
+                ("role", ASCENDING),
+                ("created_at", ASCENDING),
+                ("_id", ASCENDING),
+            ]),
+            # Пул заявителей для подбора команды, новые первыми
+            IndexModel([("role", ASCENDING), ("created_at", DESCENDING)]),
+            # Догрузка новых сотрудников в индекс кандидатов
+            IndexModel([("created_at", ASCENDING)]),
+        ]
+
+
+class EmployeeChart(BaseModel):
+    """
+    Проекция сотрудника только с данными для натальной карты.
+    """
+
+    id: PydanticObjectId = Field(alias="_id")
+    birth_date: datetime
+    birth_place: Location
+    chart: ChartSnapshot | None = None
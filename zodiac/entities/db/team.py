@@ -1,8 +1,9 @@
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
-from beanie import BackLink, Document
-from pydantic import Field
+from beanie import BackLink, Document, PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, IndexModel
 
 
 if TYPE_CHECKING:
@@ -12,6 +13,32 @@ if TYPE_CHECKING:
 class Team(Document):
     name: str
     description: str
-    employees: list[BackLink["Employee"]] = Field(default_factory=list, original_field="team") # type: ignore
+    employees: list[BackLink["Employee"]] = Field(default_factory=list, original_field="team")  # type: ignore
+    # Суммы критериев совместимости каждого участника со всеми остальными
+    compatibility: dict[str, list[float]] = Field(default_factory=dict)
+    version: int = 0  # Увеличивается при каждом изменении состава команды
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+    class Settings:
+        # Постраничный список команд: (created_at, _id) однозначно задаёт позицию курсора
+        indexes: ClassVar[list[IndexModel]] = [
+            IndexModel([("created_at", ASCENDING), ("_id", ASCENDING)])
+        ]
+
+
+class TeamVersion(BaseModel):
+    version: int = 0
+
+
+class TeamSummary(BaseModel):
+    """
+    Проекция команды для списков: без участников и сумм совместимости.
+    """
+
+    id: PydanticObjectId = Field(alias="_id")
+    name: str
+    description: str
+    created_at: datetime
+    employees_count: int = 0
+    applicants_count: int = 0
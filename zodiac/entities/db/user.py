@@ -1,7 +1,9 @@
 from datetime import UTC, datetime
+from typing import ClassVar
 
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, IndexModel
 
 
 class User(Document):
@@ -11,3 +13,6 @@ class User(Document):
 
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+    class Settings:
+        indexes: ClassVar[list[IndexModel]] = [IndexModel([("email", ASCENDING)], unique=True)]
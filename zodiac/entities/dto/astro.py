@@ -1,3 +1,4 @@
+from datetime import datetime
 from enum import StrEnum
 
 from pydantic import BaseModel, Field
@@ -44,6 +45,16 @@ ASPECTS = [
     {"name": AspectName.OPPOZICIYA, "angle": 180, "orb": 8, "score": 70.0},
 ]
 
+# Допустимые углы (с учётом орбиса) для каждого аспекта
+ASPECT_RANGES = [
+    (
+        (aspect["angle"] - aspect["orb"], aspect["angle"] + aspect["orb"]),
+        aspect["name"],
+        aspect["score"],
+    )
+    for aspect in ASPECTS
+]
+
 
 class Aspect(BaseModel):
     planet1: str
@@ -59,6 +70,15 @@ class LunarNode(BaseModel):
     element: str
 
 
+class ChartSnapshot(BaseModel):
+    birth_time: datetime
+    latitude: float
+    longitude: float
+    ascendant: float
+    longitudes: list[float]  # Эклиптические долготы в порядке PLANET_NAMES
+    lunar_node: float
+
+
 class PersonalTraits(BaseDto):
     leadership: float  # Лидерство
     stress_resilience: float  # Стрессоустойчивость
@@ -0,0 +1,20 @@
+from zodiac.entities.dto.base import BaseDto
+
+
+class ReadinessResponse(BaseDto):
+    ready: bool
+    ephemeris: str
+    ephemeris_grid: bool
+    chart_workers: int
+
+
+class CacheMetrics(BaseDto):
+    size: int
+    hits: int
+    misses: int  # Запросы к Mongo
+    coalesced: int  # Промахи, дождавшиеся уже начатого запроса
+    hit_rate: float
+
+
+class MetricsResponse(BaseDto):
+    user_cache: CacheMetrics
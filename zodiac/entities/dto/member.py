@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import EmailStr
+from pydantic import EmailStr, Field
 
 from zodiac.entities.dto.astro import AstroShit
 from zodiac.entities.dto.base import BaseDto
@@ -35,6 +35,24 @@ class AddMemberResponse(BaseDto):
     message: str
 
 
+class ImportRowError(BaseDto):
+    line: int
+    message: str
+
+
+class ImportProgress(BaseDto):
+    processed: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = Field(default_factory=list)
+    done: bool = False
+
+
+class RemoveMemberResponse(BaseDto):
+    success: bool
+    message: str
+
+
 class GetMemberResponse(BaseDto):
     success: bool
     member: Optional[MemberDto] = None
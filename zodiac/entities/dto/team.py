@@ -1,20 +1,62 @@
-from typing import Optional
+from pydantic import Field
 
+from zodiac.entities.dto.astro import CompatibilityTraits, PersonalTraits
 from zodiac.entities.dto.base import BaseDto
 from zodiac.entities.dto.member import MemberDto
+from zodiac.entities.enums.roles import Role
 
 
 class TeamDto(BaseDto):
     id: str
     name: str
     description: str
-    employees: Optional[list[MemberDto]] = None
-    applicants: Optional[list[MemberDto]] = None
+    employees: list[MemberDto] | None = None
+    applicants: list[MemberDto] | None = None
+    employees_count: int | None = None
+    applicants_count: int | None = None
 
 
 class TeamGetResponse(BaseDto):
     success: bool
-    team: Optional[TeamDto] = None
+    team: TeamDto | None = None
+
+
+class TeamMembersResponse(BaseDto):
+    success: bool
+    members: list[MemberDto] = Field(default_factory=list)
+    next_cursor: str | None = None  # None — это последняя страница
+
+
+class CandidateDto(BaseDto):
+    id: str
+    full_name: str
+    position: str
+    role: Role
+    team_id: str | None = None
+    compatibility: CompatibilityTraits
+
+
+class TeamCandidatesResponse(BaseDto):
+    success: bool
+    candidates: list[CandidateDto] = Field(default_factory=list)
+
+
+class OptimizeTeamRequest(BaseDto):
+    size: int = Field(ge=2)
+    team_id: str | None = None  # Только заявители этой команды
+    time_budget: float | None = Field(default=None, gt=0)  # Секунды
+    balance_weight: float | None = Field(default=None, ge=0, le=1)
+
+
+class OptimizeTeamResponse(BaseDto):
+    success: bool
+    message: str | None = None
+    members: list[CandidateDto] = Field(default_factory=list)
+    mean_score: float = 0.0
+    balance: float = 0.0
+    traits: PersonalTraits | None = None
+    pool_size: int = 0
+    exhaustive: bool = False
 
 
 class TeamCreateRequest(BaseDto):
@@ -24,5 +66,5 @@ class TeamCreateRequest(BaseDto):
 
 class TeamCreateResponse(BaseDto):
     success: bool
-    id: Optional[str] = None
-    message: Optional[str] = None
+    id: str | None = None
+    message: str | None = None
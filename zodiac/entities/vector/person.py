@@ -6,6 +6,8 @@ import numpy as np
 from pydantic import BaseModel, Field
 
 from zodiac.entities.dto.astro import ASPECT_RANGES, Aspect, LunarNode, PlanetPosition
+from zodiac.services.astrology import PLANET_NAMES
+from zodiac.services.embedding import encode_longitudes
 
 
 class Profile(BaseModel):
@@ -20,25 +22,11 @@ class Profile(BaseModel):
 
     def generate_vector(self) -> list[float]:
         """
-        Генерируем вектор для данного профиля на основе планет, аспектов и лунного узла.
+        Вектор профиля фиксированной раскладки (см. zodiac.services.embedding).
         """
-        vector = []
-
-        for planet in self.planets:
-            sign_index = self.get_sign_index(planet.sign)
-            vector.extend([planet.degree, sign_index, planet.house])
-
-        for aspect in self.aspects:
-            aspect_score = self.get_aspect_score(aspect)
-            vector.extend([aspect_score, aspect.angle])
-
-        lunar_node_score = self.get_lunar_node_score(self.lunar_node.element)
-        vector.extend([self.lunar_node.degree, lunar_node_score])
-
-        vector = np.array(vector)
-        normalized_vector = np.pad(vector, (0, 50 - len(vector)), mode="constant")
-
-        return normalized_vector.tolist()
+        degrees = {planet.name.lower(): planet.degree for planet in self.planets}
+        longitudes = np.array([[degrees[name] for name in PLANET_NAMES]])
+        return encode_longitudes(longitudes, np.array([self.lunar_node.degree]))[0].tolist()
 
     def get_sign_index(self, sign: str) -> int:
         """
@@ -0,0 +1,99 @@
+"""
+Нагрузочная проверка входа: python -m zodiac.login_storm [http://localhost:8000] [40]
+
+Регистрирует нового тестового пользователя и отправляет разом заданное число запросов
+/auth/login (по умолчанию 40). Пока они выполняются, /health/live запрашивается по
+расписанию раз в PROBE_INTERVAL секунд. Задержка каждой пробы отсчитывается от её
+планового старта, так что время, пока event loop занят, в неё тоже входит.
+Печатает p50/p99 проб без нагрузки и под нагрузкой и коды ответов на вход.
+
+Для сравнения «до/после» запустите сервер на нужном коммите с тем же BCRYPT_ROUNDS
+и тем же числом процессов (GRANIAN_WORKERS=1 для одного event loop).
+"""
+
+import asyncio
+import json
+import secrets
+import statistics
+import sys
+import time
+
+from collections import Counter
+from urllib.parse import urlsplit
+
+
+PROBE_INTERVAL = 0.01
+PROBE_COUNT = 300
+
+
+async def request(base_url: str, method: str, path: str, body: dict | None = None) -> int:
+    """
+    Один HTTP/1.1-запрос в отдельном соединении; возвращает код ответа.
+    """
+    url = urlsplit(base_url)
+    reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+    payload = json.dumps(body).encode() if body is not None else b""
+    head = (
+        f"{method} {url.path.rstrip('/')}/api/v1{path} HTTP/1.1\r\n"
+        f"Host: {url.netloc}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    writer.write(head.encode() + payload)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return status
+
+
+async def probe(base_url: str) -> list[float]:
+    """
+    Задержки /health/live в секундах от планового старта каждой пробы.
+    """
+    start = time.perf_counter()
+    delays = []
+
+    async def one(index: int) -> None:
+        scheduled = start + index * PROBE_INTERVAL
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        await request(base_url, "GET", "/health/live")
+        delays.append(time.perf_counter() - scheduled)
+
+    await asyncio.gather(*(one(index) for index in range(PROBE_COUNT)))
+    return delays
+
+
+def describe(delays: list[float]) -> str:
+    quantiles = statistics.quantiles(delays, n=100)
+    return f"p50 {quantiles[49] * 1000:.1f} ms, p99 {quantiles[98] * 1000:.1f} ms"
+
+
+async def main(base_url: str, logins: int) -> int:
+    credentials = {
+        "email": f"login-storm-{secrets.token_hex(4)}@example.com",
+        "password": secrets.token_urlsafe(16),
+    }
+    await request(base_url, "POST", "/auth/register", {**credentials, "fullName": "Login Storm"})
+    idle = await probe(base_url)
+
+    started = time.perf_counter()
+    storm, *statuses = await asyncio.gather(
+        probe(base_url),
+        *(request(base_url, "POST", "/auth/login", credentials) for _ in range(logins)),
+    )
+    elapsed = time.perf_counter() - started
+
+    print(f"/health/live idle:        {describe(idle)}")
+    print(f"/health/live under storm: {describe(storm)}")
+    print(f"{logins} logins in {elapsed:.1f} s: {dict(Counter(statuses))}")
+    return 0 if set(statuses) <= {200, 503} else 1
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    base_url = args[0] if args else "http://localhost:8000"
+    logins = int(args[1]) if args[1:] else 40
+    sys.exit(asyncio.run(main(base_url, logins)))
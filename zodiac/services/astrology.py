@@ -1,31 +1,32 @@
+from collections.abc import Sequence
 from datetime import datetime
+from enum import IntEnum
+from itertools import combinations
+from typing import NamedTuple
 
 import astropy.units as u
+import numpy as np
 
 from astropy.coordinates import (
-    AltAz,
     EarthLocation,
     GeocentricTrueEcliptic,
-    SkyCoord,
     get_body,
-    solar_system_ephemeris,
 )
 from astropy.time import Time
 
 from zodiac.entities.dto.astro import (
     ASPECTS,
     Aspect,
-    AspectName,
+    ChartSnapshot,
     CompatibilityTraits,
     HousePosition,
     LunarNode,
-    PersonalTraits,
     PlanetPosition,
 )
+from zodiac.services.ephemeris import ephemeris
+from zodiac.services.houses import calculate_ascendants, equal_house_cusps
 
 
-solar_system_ephemeris.set("jpl")
-
 SIGNS = [
     "Овен",
     "Телец",
@@ -43,33 +44,219 @@ SIGNS = [
 
 ELEMENTS = ["Огонь", "Земля", "Воздух", "Вода"]
 
-PLANET_NAMES = [
-    "sun",
-    "moon",
-    "mercury",
-    "venus",
-    "mars",
-    "jupiter",
-    "saturn",
-    "uranus",
-    "neptune",
-    "pluto",
-]
+
+class Planet(IntEnum):
+    SUN = 0
+    MOON = 1
+    MERCURY = 2
+    VENUS = 3
+    MARS = 4
+    JUPITER = 5
+    SATURN = 6
+    URANUS = 7
+    NEPTUNE = 8
+    PLUTO = 9
+
+
+PLANET_NAMES = [planet.name.lower() for planet in Planet]
+
+# Пары планет (i < j) в порядке перебора AstroChart.calculate_aspects
+PLANET_PAIRS = list(combinations(Planet, 2))
+
+_ASPECT_WINDOWS = [(aspect["angle"], aspect["orb"]) for aspect in ASPECTS]
+
+
+class BirthData(NamedTuple):
+    birth_time: datetime
+    latitude: float
+    longitude: float
+
+
+def aspect_index(angle: float) -> int:
+    """
+    Индекс в ASPECTS первого аспекта, в орбис которого попадает угол (0..180), или -1.
+    """
+    for index, (exact_angle, max_orb) in enumerate(_ASPECT_WINDOWS):
+        if abs(angle - exact_angle) <= max_orb:
+            return index
+    return -1
+
+
+def adjusted_aspect_score(index: int, angle: float) -> float:
+    """
+    Балл аспекта ASPECTS[index], уменьшенный пропорционально отклонению от точного угла.
+    """
+    aspect = ASPECTS[index]
+    max_orb = aspect["orb"]
+    orb = abs(angle - aspect["angle"])
+    return max(0, aspect["score"] * ((max_orb - orb) / max_orb))
+
+
+def earth_locations(latitude: float | np.ndarray, longitude: float | np.ndarray) -> EarthLocation:
+    latitude = np.asarray(latitude, dtype=float)
+    return EarthLocation(
+        lat=latitude * u.deg,
+        lon=np.asarray(longitude, dtype=float) * u.deg,
+        height=np.zeros(latitude.shape) * u.m,
+    )
+
+
+def calculate_ecliptic_longitudes(
+    time: Time, latitude: float | np.ndarray, longitude: float | np.ndarray
+) -> np.ndarray:
+    """
+    Эклиптические долготы всех планет из PLANET_NAMES формы (len(PLANET_NAMES), *time.shape).
+
+    Моменты внутри сетки эфемерид интерполируются по ней, остальные (или все, если
+    сетки нет) считаются astropy; EarthLocation строится только для них.
+    """
+    ephemeris.ensure_loaded()
+    grid = ephemeris.grid
+    if grid is None or grid.bodies != PLANET_NAMES:
+        return calculate_ecliptic_longitudes_astropy(time, earth_locations(latitude, longitude))
+    degrees, covered = grid.longitudes(time)
+    if covered.all():
+        return degrees
+    if time.isscalar:
+        return calculate_ecliptic_longitudes_astropy(time, earth_locations(latitude, longitude))
+    missing = ~covered
+    degrees[:, missing] = calculate_ecliptic_longitudes_astropy(
+        time[missing],
+        earth_locations(np.asarray(latitude)[missing], np.asarray(longitude)[missing]),
+    )
+    return degrees
+
+
+def calculate_ecliptic_longitudes_astropy(time: Time, location: EarthLocation) -> np.ndarray:
+    """
+    Эталонный расчёт долгот через astropy.
+
+    Работает как для одного момента, так и для массива моментов: по одной
+    трансформации на планету для всего массива.
+    """
+    ephemeris.ensure_loaded()
+    frame = GeocentricTrueEcliptic(equinox=time)
+    return np.array([
+        get_body(planet, time, location).transform_to(frame).lon.degree % 360
+        for planet in PLANET_NAMES
+    ])
 
 
 class AstroChart:
+    """
+    Натальная карта: асцендент и эклиптические долготы планет (массив float64,
+    индексируется Planet). Дома, аспекты и лунный узел выводятся из них; pydantic-модели
+    (planets, houses, aspects, lunar_node) строятся только при обращении — для ответов API.
+
+    Конструктор ничего не считает: асцендент и долготы вычисляются при первом
+    обращении и запоминаются, оба по одному объекту Time карты. Карте из снимка
+    или из from_many они уже заданы; карта, созданная напрямую, считает только то,
+    что прочитано (расчёту совместимости нужны одни долготы).
+    """
+
+    __slots__ = (
+        "_ascendant",
+        "_degrees",
+        "_time",
+        "birth_time",
+        "latitude",
+        "longitude",
+    )
+
     def __init__(self, birth_time: datetime, latitude: float, longitude: float):
         self.birth_time = birth_time
-        self.time = Time(self.birth_time)
         self.latitude = latitude
         self.longitude = longitude
-        self.location = EarthLocation(lat=latitude * u.deg, lon=longitude * u.deg, height=0 * u.m)
-        self.ascendant = self.calculate_ascendant()
-        self.houses = self.calculate_houses()
-        self.planets = self.calculate_planet_positions()
-        self.assign_planets_to_houses()
-        self.aspects = self.calculate_aspects()
-        self.lunar_node = self.calculate_lunar_nodes()
+        self._time = None
+        self._ascendant = None
+        self._degrees = None
+
+    @classmethod
+    def from_many(cls, births: Sequence[BirthData]) -> list["AstroChart"]:
+        """
+        Строит карты для нескольких рождений за один векторизованный проход astropy.
+
+        Результат совпадает с AstroChart(*birth) для каждого элемента.
+        """
+        if not births:
+            return []
+        birth_times, latitudes, longitudes = zip(*births)
+        times = Time(list(birth_times))
+        ascendants = calculate_ascendants(times, np.asarray(longitudes, dtype=float))
+        degrees = calculate_ecliptic_longitudes(times, latitudes, longitudes)
+
+        charts = []
+        for i, birth in enumerate(births):
+            chart = cls(*birth)
+            chart._time = times[i]
+            chart.populate(float(ascendants[i]), degrees[:, i])
+            charts.append(chart)
+        return charts
+
+    @classmethod
+    def from_snapshot(cls, snapshot: ChartSnapshot) -> "AstroChart":
+        """
+        Восстанавливает карту из сохранённого снимка без обращения к эфемеридам.
+        """
+        chart = cls(snapshot.birth_time, snapshot.latitude, snapshot.longitude)
+        chart.populate(snapshot.ascendant, snapshot.longitudes)
+        return chart
+
+    def to_snapshot(self) -> ChartSnapshot:
+        return ChartSnapshot(
+            birth_time=self.birth_time,
+            latitude=self.latitude,
+            longitude=self.longitude,
+            ascendant=self.ascendant,
+            longitudes=self.degrees.tolist(),
+            lunar_node=self.lunar_node_degree,
+        )
+
+    @property
+    def birth_data(self) -> BirthData:
+        return BirthData(self.birth_time, self.latitude, self.longitude)
+
+    @property
+    def time(self) -> Time:
+        if self._time is None:
+            self._time = Time(self.birth_time)
+        return self._time
+
+    @property
+    def ascendant(self) -> float:
+        if self._ascendant is None:
+            self._ascendant = self.calculate_ascendant()
+        return self._ascendant
+
+    @property
+    def degrees(self) -> np.ndarray:
+        if self._degrees is None:
+            self._degrees = calculate_ecliptic_longitudes(self.time, self.latitude, self.longitude)
+        return self._degrees
+
+    def populate(self, ascendant: float, degrees: Sequence[float]) -> None:
+        self._ascendant = ascendant
+        self._degrees = np.array(degrees, dtype=float)
+
+    @property
+    def planets(self) -> list[PlanetPosition]:
+        return self.calculate_planet_positions(self.degrees)
+
+    @property
+    def houses(self) -> list[HousePosition]:
+        return self.calculate_houses()
+
+    @property
+    def aspects(self) -> list[Aspect]:
+        return self.calculate_aspects()
+
+    @property
+    def lunar_node(self) -> LunarNode:
+        return self.calculate_lunar_nodes()
+
+    @property
+    def lunar_node_degree(self) -> float:
+        return float((self.degrees[Planet.MOON] - self.degrees[Planet.SUN] + 180) % 360)
 
     def get_zodiac_sign(self, degree: float) -> str:
         degree = degree % 360
@@ -87,84 +274,62 @@ class AstroChart:
                 return i + 1
         return 12
 
-    def calculate_planet_positions(self) -> list[PlanetPosition]:
-        planets_positions = []
-        for planet in PLANET_NAMES:
-            body = get_body(planet, self.time, self.location)
-            ecliptic = body.transform_to(GeocentricTrueEcliptic(equinox=self.time))
-            degree = ecliptic.lon.degree % 360
-            sign = self.get_zodiac_sign(degree)
-            planets_positions.append(
-                PlanetPosition(
-                    name=planet.capitalize(),
-                    degree=degree,
-                    sign=sign,
-                    house=0,  # Будет назначен позже
-                )
+    def calculate_planet_positions(self, degrees: Sequence[float]) -> list[PlanetPosition]:
+        return [
+            PlanetPosition(
+                name=planet.name.capitalize(),
+                degree=degree,
+                sign=self.get_zodiac_sign(degree),
+                house=self.get_house(degree),
             )
-        return planets_positions
+            for planet, degree in zip(Planet, map(float, degrees))
+        ]
 
     def calculate_ascendant(self) -> float:
-        altaz_frame = AltAz(obstime=self.time, location=self.location)
-        east = SkyCoord(az=90 * u.deg, alt=0 * u.deg, frame=altaz_frame)
-        equatorial = east.transform_to("icrs")
-        ecliptic = equatorial.transform_to(GeocentricTrueEcliptic(equinox=self.time))
-        return ecliptic.lon.degree % 360
+        return float(calculate_ascendants(self.time, self.longitude))
 
     def calculate_houses(self) -> list[HousePosition]:
         return [
-            HousePosition(
-                name=f"House {i}",
-                degree=(self.ascendant + (i - 1) * 30) % 360,
-                sign=self.get_zodiac_sign((self.ascendant + (i - 1) * 30) % 360),
-            )
-            for i in range(1, 13)
+            HousePosition(name=f"House {i}", degree=degree, sign=self.get_zodiac_sign(degree))
+            for i, degree in enumerate(equal_house_cusps(self.ascendant).tolist(), start=1)
         ]
 
-    def assign_planets_to_houses(self) -> None:
-        for planet in self.planets:
-            planet.house = self.get_house(planet.degree)
-
-    def calculate_aspects(self) -> list[Aspect]:
+    def planet_aspects(self) -> list[tuple[Planet, Planet, int, float]]:
+        """
+        Аспекты между планетами карты: (планета 1, планета 2, индекс в ASPECTS, угол).
+        """
         aspects = []
-        for i, p1 in enumerate(self.planets):
-            for p2 in self.planets[i + 1 :]:
-                angle = abs(p1.degree - p2.degree)
-                angle = angle if angle <= 180 else 360 - angle
-                aspect, base_score, orb = self.determine_aspect(angle)
-
-                if aspect:
-                    aspects.append(
-                        Aspect(
-                            planet1=p1.name,
-                            planet2=p2.name,
-                            aspect=aspect,
-                            angle=angle,
-                            house1=p1.house,
-                            house2=p2.house,
-                        )
-                    )
+        for first, second in PLANET_PAIRS:
+            angle = abs(float(self.degrees[first]) - float(self.degrees[second]))
+            angle = angle if angle <= 180 else 360 - angle
+            index = aspect_index(angle)
+            if index >= 0:
+                aspects.append((first, second, index, angle))
         return aspects
 
+    def calculate_aspects(self) -> list[Aspect]:
+        return [
+            Aspect(
+                planet1=first.name.capitalize(),
+                planet2=second.name.capitalize(),
+                aspect=ASPECTS[index]["name"],
+                angle=angle,
+                house1=self.get_house(float(self.degrees[first])),
+                house2=self.get_house(float(self.degrees[second])),
+            )
+            for first, second, index, angle in self.planet_aspects()
+        ]
+
     def determine_aspect(self, angle: float) -> tuple[str, float, float]:
-        for aspect in ASPECTS:
-            exact_angle = aspect["angle"]
-            max_orb = aspect["orb"]
-            orb = abs(angle - exact_angle)
-            if orb <= max_orb:
-                return aspect["name"], aspect["score"], orb
-        return None, 0, None
+        index = aspect_index(angle)
+        if index < 0:
+            return None, 0, None
+        aspect = ASPECTS[index]
+        return aspect["name"], aspect["score"], abs(angle - aspect["angle"])
 
     def calculate_lunar_nodes(self) -> LunarNode:
-        sun = get_body("sun", self.time, self.location).transform_to(
-            GeocentricTrueEcliptic(equinox=self.time)
-        )
-        moon = get_body("moon", self.time, self.location).transform_to(
-            GeocentricTrueEcliptic(equinox=self.time)
-        )
-        node_pos = (moon.lon.degree - sun.lon.degree + 180) % 360
-        element = self.get_zodiac_element(node_pos)
-        return LunarNode(degree=node_pos, element=element)
+        node_pos = self.lunar_node_degree
+        return LunarNode(degree=node_pos, element=self.get_zodiac_element(node_pos))
 
     def get_zodiac_element(self, longitude: float) -> str:
         index = int(longitude // 30) % 4
@@ -175,12 +340,20 @@ class AstroChart:
             return max(0, min(score, 100))
 
         traits = CompatibilityTraits(
-            emotional=normalize_score(self.calculate_aspect_score("moon", "venus", other)),
-            intellectual=normalize_score(self.calculate_aspect_score("mercury", "saturn", other)),
-            goals=normalize_score(self.calculate_aspect_score("jupiter", "saturn", other)),
-            problem_solving=normalize_score(self.calculate_aspect_score("mars", "saturn", other)),
+            emotional=normalize_score(
+                self.calculate_aspect_score(Planet.MOON, Planet.VENUS, other)
+            ),
+            intellectual=normalize_score(
+                self.calculate_aspect_score(Planet.MERCURY, Planet.SATURN, other)
+            ),
+            goals=normalize_score(
+                self.calculate_aspect_score(Planet.JUPITER, Planet.SATURN, other)
+            ),
+            problem_solving=normalize_score(
+                self.calculate_aspect_score(Planet.MARS, Planet.SATURN, other)
+            ),
             decision_making=normalize_score(
-                self.calculate_aspect_score("neptune", "saturn", other)
+                self.calculate_aspect_score(Planet.NEPTUNE, Planet.SATURN, other)
             ),
             mean_score=0.0,
         )
@@ -188,140 +361,15 @@ class AstroChart:
 
         return traits
 
-    def calculate_aspect_score(self, planet1: str, planet2: str, other: "AstroChart") -> float:
-        def get_planet_position(chart, planet):
-            return next((p for p in chart.planets if p.name.lower() == planet.lower()), None)
-
-        p1 = get_planet_position(self, planet1)
-        p2 = get_planet_position(other, planet2)
-
-        if not p1 or not p2:
-            return 0.0
-
-        angle = abs(p1.degree - p2.degree)
+    def calculate_aspect_score(
+        self, planet1: Planet, planet2: Planet, other: "AstroChart"
+    ) -> float:
+        angle = abs(float(self.degrees[planet1]) - float(other.degrees[planet2]))
         angle = angle if angle <= 180 else 360 - angle
-
-        aspect, base_score, orb = self.determine_aspect(angle)
-        if not aspect:
+        index = aspect_index(angle)
+        if index < 0:
             return 0.0
-
-        max_orb = next(a["orb"] for a in ASPECTS if a["name"] == aspect)
-        adjusted_score = base_score * ((max_orb - orb) / max_orb)
-        adjusted_score = max(0, adjusted_score)
-        return adjusted_score
-
-    def calculate_personal_traits(self) -> PersonalTraits:
-        traits = PersonalTraits(
-            leadership=0.0,
-            stress_resilience=0.0,
-            communication=0.0,
-            responsibility=0.0,
-            ambition=0.0,
-        )
-
-        planet_influences = {
-            "sun": ("leadership", ["Овен", "Лев", "Стрелец"], [1, 10]),
-            "mars": ("leadership", ["Овен", "Скорпион"], [1, 11]),
-            "saturn": [
-                ("stress_resilience", ["Телец", "Дева", "Козерог"], [6, 10]),
-                ("responsibility", ["Козерог", "Дева"], [6, 10]),
-            ],
-            "mercury": ("communication", ["Близнецы", "Весы", "Водолей"], [3, 7]),
-            "venus": ("communication", ["Близнецы", "Весы"], [3, 7]),
-            "jupiter": ("ambition", ["Стрелец", "Лев"], [9, 10]),
-            "pluto": ("ambition", ["Скорпион", "Козерог"], [8, 10]),
-        }
-
-        for planet_name, influences in planet_influences.items():
-            planet = next((p for p in self.planets if p.name.lower() == planet_name), None)
-            if planet:
-                if isinstance(influences, list):
-                    for trait, signs, houses in influences:
-                        setattr(
-                            traits,
-                            trait,
-                            getattr(traits, trait)
-                            + self.influence_score(planet.degree, signs, houses),
-                        )
-                else:
-                    trait, signs, houses = influences
-                    setattr(
-                        traits,
-                        trait,
-                        getattr(traits, trait) + self.influence_score(planet.degree, signs, houses),
-                    )
-
-        for aspect in self.aspects:
-            if aspect.aspect in {AspectName.TRIN, AspectName.SOEDINENIE}:
-                if "sun" in {aspect.planet1.lower(), aspect.planet2.lower()}:
-                    traits.leadership += 5
-                if "mercury" in {aspect.planet1.lower(), aspect.planet2.lower()}:
-                    traits.communication += 5
-                if "mars" in {aspect.planet1.lower(), aspect.planet2.lower()}:
-                    traits.ambition += 5
-            if aspect.aspect == AspectName.KVADRATURA:
-                traits.stress_resilience = max(0, traits.stress_resilience - 5)
-
-        total = sum(vars(traits).values())
-        if total > 0:
-            for trait in vars(traits):
-                setattr(traits, trait, (getattr(traits, trait) / total) * 100)
-
-        return traits
-
-    def influence_score(
-        self, degree: float, relevant_signs: list[str], houses: list[int], orb: float = 5.0
-    ) -> float:
-        """
-        Рассчитывает влияние планеты на основе положения в знаке, доме и аспектах.
-
-        :param degree: Положение планеты в градусах (0–360).
-        :param relevant_signs: Знаки, которые усиливают влияние.
-        :param houses: Дома, которые усиливают влияние.
-        :param orb: Допустимая погрешность (орбис) для аспектов.
-        :return: Итоговый балл влияния.
-        """
-        score = 0
-
-        sign = self.get_zodiac_sign(degree)
-        house = self.get_house(degree)
-
-        if sign in relevant_signs:
-            score += 10
-
-        if house in houses:
-            score += 10
-
-        planet_name = next((p.name for p in self.planets if p.degree == degree), None)
-        if not planet_name:
-            return score
-
-        for aspect in self.aspects:
-            if planet_name.lower() not in {aspect.planet1.lower(), aspect.planet2.lower()}:
-                continue
-
-            aspect_def = next((a for a in ASPECTS if a["name"] == aspect.aspect), None)
-            if not aspect_def:
-                continue
-
-            base_score = aspect_def["score"]
-            max_orb = aspect_def["orb"]
-
-            orb = abs(aspect.angle - aspect_def["angle"])
-            if orb > max_orb:
-                continue
-
-            adjusted_score = base_score * ((max_orb - orb) / max_orb)
-            adjusted_score = max(0, adjusted_score)
-
-            score += adjusted_score / 10
-
-        elements_score = {"Огонь": 5, "Земля": 3, "Воздух": 4, "Вода": 2}
-        element = self.get_zodiac_element(degree)
-        if element in elements_score:
-            score += elements_score[element]
-
-        return score
+        return adjusted_aspect_score(index, angle)
 
     def calculate_group_compatibility(self, others: list["AstroChart"]) -> CompatibilityTraits:
         total_compatibility = CompatibilityTraits(
@@ -411,7 +459,9 @@ if __name__ == "__main__":
 
     print("Compatibility score:", AstroChart.calculate_compatibility_score(compatibility))
 
-    traits = chart.calculate_personal_traits()
+    from zodiac.services.traits import personal_traits
+
+    [traits] = personal_traits([chart])
     print("Leadership:", traits.leadership)
     print("Stress resilience:", traits.stress_resilience)
     print("Communication:", traits.communication)
@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+
+
+class LRUCache[K: Hashable, V]:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[K, V] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._data
+
+    def get(self, key: K) -> V | None:
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return None
+        return self._data[key]
+
+    def set(self, key: K, value: V) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        return self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class TTLCache[K: Hashable, V]:
+    """
+    LRU, записи которого устаревают через ttl секунд после записи.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.ttl = ttl
+        self._entries: LRUCache[K, tuple[float, V]] = LRUCache(maxsize)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key)
+            return None
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._entries.set(key, (time.monotonic() + self.ttl, value))
+
+    def pop(self, key: K) -> V | None:
+        entry = self._entries.pop(key)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SingleFlight[K: Hashable, V]:
+    """
+    Одновременные вызовы run с одним ключом ждут одного выполнения func.
+    """
+
+    def __init__(self):
+        self._running: dict[K, asyncio.Future[V]] = {}
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._running
+
+    async def run(self, key: K, func: Callable[[], Awaitable[V]]) -> V:
+        future = self._running.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._running[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        # shield: отмена одного из ожидающих не отменяет выполнение для остальных
+        return await asyncio.shield(future)
+
+    def _finish(self, key: K, future: asyncio.Future[V]) -> None:
+        if self._running.get(key) is future:
+            del self._running[key]
+
+    def forget(self, key: K) -> None:
+        """
+        Следующий run с этим ключом запустит func заново, не дожидаясь текущего.
+        """
+        self._running.pop(key, None)
+
+    def clear(self) -> None:
+        self._running.clear()
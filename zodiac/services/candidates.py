@@ -0,0 +1,135 @@
+import asyncio
+import time
+
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+
+from beanie import PydanticObjectId
+from beanie.operators import GTE, In
+
+from zodiac.config import (
+    CANDIDATE_OVERSAMPLE,
+    CANDIDATE_SYNC_INTERVAL,
+    COMPATIBILITY_HARMONICS,
+    IMPORT_BATCH_SIZE,
+)
+from zodiac.entities.db.employee import Employee
+from zodiac.entities.db.team import Team
+from zodiac.entities.dto.astro import CompatibilityTraits
+from zodiac.services.astrology import AstroChart
+from zodiac.services.chart_cache import chart_cache
+from zodiac.services.compatibility import (
+    COMPATIBILITY_FIELDS,
+    candidate_vectors,
+    compatibility_matrix,
+    longitude_matrix,
+    team_query,
+    to_traits,
+)
+from zodiac.services.vector_index import VectorIndex, create_vector_index
+
+
+# Запас при догрузке новых сотрудников: записи других процессов могут прийти
+# с небольшим опозданием относительно своего created_at
+SYNC_OVERLAP = timedelta(minutes=1)
+
+
+class CandidateSearch:
+    """
+    Поиск сотрудников, наиболее совместимых с командой.
+
+    Каждый сотрудник хранится в векторном индексе как candidate_vectors его карты;
+    вектор команды (team_query) строится по картам её участников, и скалярное
+    произведение приближает среднюю совместимость кандидата с командой. Индекс
+    возвращает limit * oversample ближайших, после чего они переранжируются точным
+    расчётом compatibility_matrix.
+
+    Индекс догружает новых сотрудников из Mongo не чаще раза в sync_interval секунд,
+    поэтому видит и тех, кого добавили другие процессы.
+    """
+
+    def __init__(
+        self,
+        index: VectorIndex,
+        harmonics: int = COMPATIBILITY_HARMONICS,
+        oversample: int = CANDIDATE_OVERSAMPLE,
+        sync_interval: float = CANDIDATE_SYNC_INTERVAL,
+    ):
+        self.index = index
+        self.harmonics = harmonics
+        self.oversample = oversample
+        self.sync_interval = sync_interval
+        self._synced_at: datetime | None = None
+        self._last_sync = float("-inf")
+        self._sync_lock = asyncio.Lock()
+
+    async def add(self, employees: Sequence[Employee], charts: Sequence[AstroChart]) -> None:
+        if not employees:
+            return
+        await self.index.upsert(
+            [str(employee.id) for employee in employees],
+            candidate_vectors(longitude_matrix(charts), self.harmonics),
+        )
+
+    async def remove(self, employee_ids: Sequence[str]) -> None:
+        await self.index.remove(employee_ids)
+
+    async def sync(self) -> None:
+        async with self._sync_lock:
+            if time.monotonic() - self._last_sync < self.sync_interval:
+                return
+            query = Employee.find()
+            if self._synced_at is not None:
+                query = Employee.find(GTE(Employee.created_at, self._synced_at - SYNC_OVERLAP))
+            synced_at = self._synced_at
+            batch: list[Employee] = []
+            async for employee in query:
+                batch.append(employee)
+                if synced_at is None or employee.created_at > synced_at:
+                    synced_at = employee.created_at
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    await self.add(batch, await chart_cache.get_many(batch))
+                    batch = []
+            if batch:
+                await self.add(batch, await chart_cache.get_many(batch))
+            self._synced_at = synced_at
+            self._last_sync = time.monotonic()
+
+    async def search(self, team: Team, limit: int) -> list[tuple[Employee, CompatibilityTraits]]:
+        """
+        Лучшие limit сотрудников не из команды по средней совместимости с её участниками
+        (в направлении кандидат -> участник, как calculate_group_compatibility).
+        """
+        if limit <= 0:
+            return []
+        members = await Employee.find(Employee.team.id == team.id).to_list()
+        if not members:
+            return []
+        await self.sync()
+
+        team_longitudes = longitude_matrix(await chart_cache.get_many(members))
+        member_ids = {str(member.id) for member in members}
+        hits = await self.index.search(
+            team_query(team_longitudes, self.harmonics),
+            limit * self.oversample + len(member_ids),
+        )
+        candidate_ids = [id_ for id_, _ in hits if id_ not in member_ids]
+        if not candidate_ids:
+            return []
+
+        candidates = await Employee.find(
+            In(Employee.id, [PydanticObjectId(id_) for id_ in candidate_ids])
+        ).to_list()
+        charts = await chart_cache.get_many(candidates)
+        scores = compatibility_matrix(longitude_matrix(charts), team_longitudes).mean(axis=1)
+        ranked = sorted(
+            zip(candidates, map(to_traits, scores)),
+            key=lambda match: match[1].mean_score,
+            reverse=True,
+        )
+        return ranked[:limit]
+
+
+candidate_search = CandidateSearch(
+    create_vector_index(2 * COMPATIBILITY_HARMONICS * len(COMPATIBILITY_FIELDS))
+)
@@ -0,0 +1,95 @@
+import asyncio
+
+from collections.abc import Sequence
+
+from beanie.operators import Set
+
+from zodiac.config import CHART_CACHE_SIZE
+from zodiac.entities.db.employee import Employee, EmployeeChart
+from zodiac.entities.dto.astro import ChartSnapshot
+from zodiac.services.astrology import AstroChart, BirthData
+from zodiac.services.cache import LRUCache
+from zodiac.services.executor import chart_executor
+
+
+def birth_data_of(employee: Employee | EmployeeChart) -> BirthData:
+    return BirthData(
+        birth_time=employee.birth_date,
+        latitude=employee.birth_place.latitude,
+        longitude=employee.birth_place.longitude,
+    )
+
+
+def is_snapshot_fresh(snapshot: ChartSnapshot | None, birth: BirthData) -> bool:
+    return snapshot is not None and (
+        snapshot.birth_time,
+        snapshot.latitude,
+        snapshot.longitude,
+    ) == tuple(birth)
+
+
+class ChartCache:
+    """
+    Кэш натальных карт перед конструктором AstroChart.
+
+    Сначала ищет карту в LRU процесса, затем в снимке, сохранённом в документе
+    Employee, и только после этого считает её через astropy в пуле chart_executor. Ключ — данные
+    рождения, поэтому снимок становится недействительным только при изменении
+    birth_date или birth_place.
+    """
+
+    def __init__(self, maxsize: int = CHART_CACHE_SIZE):
+        self._charts: LRUCache[BirthData, AstroChart] = LRUCache(maxsize)
+
+    async def build(self, birth: BirthData) -> AstroChart:
+        [chart] = await self.build_many([birth])
+        return chart
+
+    async def build_many(self, births: Sequence[BirthData]) -> list[AstroChart]:
+        charts = [self._charts.get(birth) for birth in births]
+        missing = list(dict.fromkeys(b for b, chart in zip(births, charts) if chart is None))
+        if missing:
+            computed = dict(zip(missing, await chart_executor.build_many(missing)))
+            for birth, chart in computed.items():
+                self._charts.set(birth, chart)
+            charts = [chart or computed[birth] for birth, chart in zip(births, charts)]
+        return charts
+
+    async def get(self, employee: Employee | EmployeeChart) -> AstroChart:
+        [chart] = await self.get_many([employee])
+        return chart
+
+    async def get_many(self, employees: Sequence[Employee | EmployeeChart]) -> list[AstroChart]:
+        """
+        Карты сотрудников; принимает и документы Employee, и проекции EmployeeChart.
+        Устаревшие снимки перезаписываются в Mongo.
+        """
+        births = [birth_data_of(employee) for employee in employees]
+        stale = []
+        for i, (employee, birth) in enumerate(zip(employees, births)):
+            if not is_snapshot_fresh(employee.chart, birth):
+                stale.append(i)
+            elif birth not in self._charts:
+                self._charts.set(birth, AstroChart.from_snapshot(employee.chart))
+
+        charts = await self.build_many(births)
+
+        for i in stale:
+            employees[i].chart = charts[i].to_snapshot()
+        if stale:
+            await asyncio.gather(
+                *(
+                    Employee.find_one(Employee.id == employees[i].id).update(
+                        Set({Employee.chart: employees[i].chart})
+                    )
+                    for i in stale
+                )
+            )
+
+        return charts
+
+    def clear(self) -> None:
+        self._charts.clear()
+
+
+chart_cache = ChartCache()
@@ -0,0 +1,130 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+from zodiac.config import COMPATIBILITY_HARMONICS
+from zodiac.entities.dto.astro import ASPECTS, CompatibilityTraits
+from zodiac.services.astrology import PLANET_NAMES, AstroChart
+
+
+# Пары планет (первая карта, вторая карта) для критериев CompatibilityTraits
+COMPATIBILITY_PAIRS = {
+    "emotional": ("moon", "venus"),
+    "intellectual": ("mercury", "saturn"),
+    "goals": ("jupiter", "saturn"),
+    "problem_solving": ("mars", "saturn"),
+    "decision_making": ("neptune", "saturn"),
+}
+COMPATIBILITY_FIELDS = tuple(COMPATIBILITY_PAIRS)
+
+_FIRST_PLANETS = np.array([PLANET_NAMES.index(p1) for p1, _ in COMPATIBILITY_PAIRS.values()])
+_SECOND_PLANETS = np.array([PLANET_NAMES.index(p2) for _, p2 in COMPATIBILITY_PAIRS.values()])
+
+# Окна орбисов аспектов не пересекаются, поэтому подходящий аспект для угла
+# находится бинарным поиском по отсортированным началам окон.
+_ASPECTS_BY_ANGLE = sorted(ASPECTS, key=lambda aspect: aspect["angle"])
+ASPECT_ANGLES = np.array([aspect["angle"] for aspect in _ASPECTS_BY_ANGLE], dtype=float)
+ASPECT_ORBS = np.array([aspect["orb"] for aspect in _ASPECTS_BY_ANGLE], dtype=float)
+ASPECT_SCORES = np.array([aspect["score"] for aspect in _ASPECTS_BY_ANGLE], dtype=float)
+ASPECT_NAMES = [aspect["name"] for aspect in _ASPECTS_BY_ANGLE]
+_ORB_WINDOW_STARTS = ASPECT_ANGLES - ASPECT_ORBS
+
+
+def longitude_matrix(charts: Sequence[AstroChart]) -> np.ndarray:
+    """
+    Матрица (N, len(PLANET_NAMES)) эклиптических долгот планет.
+    """
+    matrix = np.empty((len(charts), len(PLANET_NAMES)))
+    for i, chart in enumerate(charts):
+        matrix[i] = chart.degrees
+    return matrix
+
+
+def angular_distance(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    angle = np.abs(first - second)
+    return np.minimum(angle, 360 - angle)
+
+
+def aspect_indices(angles: np.ndarray) -> np.ndarray:
+    """
+    Индекс аспекта в порядке ASPECT_ANGLES для массива углов (0..180) или -1, если угол
+    не попадает ни в один орбис — векторная версия AstroChart.determine_aspect.
+    """
+    index = np.clip(np.searchsorted(_ORB_WINDOW_STARTS, angles, side="right") - 1, 0, None)
+    return np.where(np.abs(angles - ASPECT_ANGLES[index]) <= ASPECT_ORBS[index], index, -1)
+
+
+def aspect_scores(angles: np.ndarray) -> np.ndarray:
+    """
+    Балл аспекта с поправкой на орбис для массива углов — векторная версия
+    AstroChart.calculate_aspect_score.
+    """
+    index = np.clip(np.searchsorted(_ORB_WINDOW_STARTS, angles, side="right") - 1, 0, None)
+    max_orb = ASPECT_ORBS[index]
+    orb = np.abs(angles - ASPECT_ANGLES[index])
+    scores = ASPECT_SCORES[index] * ((max_orb - orb) / max_orb)
+    return np.where(orb <= max_orb, np.maximum(scores, 0), 0.0)
+
+
+def compatibility_matrix(longitudes: np.ndarray, others: np.ndarray | None = None) -> np.ndarray:
+    """
+    Совместимость каждой карты из longitudes с каждой картой из others.
+
+    :param longitudes: Долготы планет формы (N, len(PLANET_NAMES)).
+    :param others: Долготы планет формы (M, len(PLANET_NAMES)), по умолчанию longitudes.
+    :return: Массив (N, M, 5) критериев в порядке COMPATIBILITY_FIELDS; элемент [i, j]
+        совпадает с charts[i].calculate_compatibility(others[j]).
+    """
+    if others is None:
+        others = longitudes
+    first = longitudes[:, _FIRST_PLANETS][:, None, :]
+    second = others[:, _SECOND_PLANETS][None, :, :]
+    return np.clip(aspect_scores(angular_distance(first, second)), 0, 100)
+
+
+def aspect_score_harmonics(harmonics: int, samples: int = 36_000) -> np.ndarray:
+    """
+    Коэффициенты ряда Фурье балла аспекта как функции угла между планетами:
+    score(Δ) ≈ c[0] + Σ c[k]·cos(kΔ), k = 1..harmonics.
+    """
+    angles = np.arange(samples) * (360 / samples)
+    coefficients = np.fft.rfft(aspect_scores(angular_distance(angles, 0.0))).real / samples
+    coefficients[1:] *= 2
+    return coefficients[: harmonics + 1]
+
+
+def _harmonic_features(longitudes: np.ndarray, harmonics: int) -> np.ndarray:
+    phases = np.radians(longitudes)[..., None] * np.arange(1, harmonics + 1)
+    return np.concatenate([np.cos(phases), np.sin(phases)], axis=-1)
+
+
+def candidate_vectors(
+    longitudes: np.ndarray, harmonics: int = COMPATIBILITY_HARMONICS
+) -> np.ndarray:
+    """
+    Векторы кандидатов для поиска по скалярному произведению, форма
+    (N, 5 * 2 * harmonics), float32.
+
+    Из cos(k(x - y)) = cos kx·cos ky + sin kx·sin ky следует, что скалярное
+    произведение вектора кандидата с team_query(...) приближает среднюю по команде
+    совместимость кандидата (с точностью до константы и множителя). Все векторы
+    одной длины, поэтому подходит и косинусная мера.
+    """
+    features = _harmonic_features(longitudes[:, _FIRST_PLANETS], harmonics)
+    return np.ascontiguousarray(features.reshape(len(longitudes), -1), dtype=np.float32)
+
+
+def team_query(longitudes: np.ndarray, harmonics: int = COMPATIBILITY_HARMONICS) -> np.ndarray:
+    """
+    Вектор запроса для команды с долготами планет longitudes формы (N, len(PLANET_NAMES)).
+    """
+    weights = aspect_score_harmonics(harmonics)[1:]
+    features = _harmonic_features(longitudes[:, _SECOND_PLANETS], harmonics)
+    query = features.mean(axis=0) * np.concatenate([weights, weights])
+    return query.reshape(-1).astype(np.float32)
+
+
+def to_traits(scores: Sequence[float]) -> CompatibilityTraits:
+    traits = CompatibilityTraits(**dict(zip(COMPATIBILITY_FIELDS, map(float, scores))))
+    traits.mean_score = AstroChart.calculate_compatibility_score(traits)
+    return traits
@@ -0,0 +1,70 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+from zodiac.services.astrology import PLANET_NAMES, PLANET_PAIRS, AstroChart
+from zodiac.services.compatibility import (
+    ASPECT_ANGLES,
+    angular_distance,
+    aspect_indices,
+    longitude_matrix,
+)
+
+
+_FIRST_PLANETS = np.array([first for first, _ in PLANET_PAIRS])
+_SECOND_PLANETS = np.array([second for _, second in PLANET_PAIRS])
+
+# Раскладка вектора: (cos, sin) долготы каждой планеты, one-hot аспекта для каждой
+# пары планет (нули, если аспекта нет), (cos, sin) долготы лунного узла
+PLANETS_SLICE = slice(0, 2 * len(PLANET_NAMES))
+ASPECTS_SLICE = slice(
+    PLANETS_SLICE.stop, PLANETS_SLICE.stop + len(PLANET_PAIRS) * len(ASPECT_ANGLES)
+)
+NODE_SLICE = slice(ASPECTS_SLICE.stop, ASPECTS_SLICE.stop + 2)
+EMBEDDING_DIMENSION = NODE_SLICE.stop
+
+
+def _circular(degrees: np.ndarray) -> np.ndarray:
+    radians = np.radians(degrees)
+    return np.stack([np.cos(radians), np.sin(radians)], axis=-1)
+
+
+def encode_longitudes(longitudes: np.ndarray, lunar_nodes: np.ndarray | None = None) -> np.ndarray:
+    """
+    Векторы карт фиксированной раскладки по долготам планет.
+
+    :param longitudes: Долготы планет формы (N, len(PLANET_NAMES)) в порядке PLANET_NAMES.
+    :param lunar_nodes: Долготы лунного узла формы (N,); по умолчанию считаются
+        из Солнца и Луны, как в AstroChart.calculate_lunar_nodes.
+    :return: Непрерывная float32-матрица (N, EMBEDDING_DIMENSION).
+    """
+    longitudes = np.asarray(longitudes, dtype=float).reshape(-1, len(PLANET_NAMES))
+    if lunar_nodes is None:
+        sun = longitudes[:, PLANET_NAMES.index("sun")]
+        moon = longitudes[:, PLANET_NAMES.index("moon")]
+        lunar_nodes = (moon - sun + 180) % 360
+
+    embeddings = np.zeros((len(longitudes), EMBEDDING_DIMENSION), dtype=np.float32)
+    embeddings[:, PLANETS_SLICE] = _circular(longitudes).reshape(
+        len(longitudes), PLANETS_SLICE.stop
+    )
+
+    aspects = aspect_indices(
+        angular_distance(longitudes[:, _FIRST_PLANETS], longitudes[:, _SECOND_PLANETS])
+    )
+    rows, pairs = np.nonzero(aspects >= 0)
+    columns = ASPECTS_SLICE.start + pairs * len(ASPECT_ANGLES) + aspects[rows, pairs]
+    embeddings[rows, columns] = 1.0
+
+    embeddings[:, NODE_SLICE] = _circular(np.asarray(lunar_nodes, dtype=float))
+    return embeddings
+
+
+def encode_charts(charts: Sequence[AstroChart]) -> np.ndarray:
+    """
+    Векторы карт одним вызовом: непрерывная float32-матрица (N, EMBEDDING_DIMENSION)
+    для векторного индекса.
+    """
+    return encode_longitudes(
+        longitude_matrix(charts), np.array([chart.lunar_node_degree for chart in charts])
+    )
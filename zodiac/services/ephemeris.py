@@ -0,0 +1,75 @@
+import threading
+
+from datetime import UTC, datetime
+
+import astropy.units as u
+
+from astropy.coordinates import (
+    EarthLocation,
+    GeocentricTrueEcliptic,
+    get_body,
+    solar_system_ephemeris,
+)
+from astropy.time import Time
+from astropy.utils import iers
+
+from zodiac.config import EPHEMERIS, IERS_AUTO_DOWNLOAD
+from zodiac.services.ephemeris_grid import EphemerisGrid, load_grid
+from zodiac.services.houses import calculate_ascendants
+
+
+WARM_UP_TIME = datetime(2000, 1, 1, 12, tzinfo=UTC)
+
+
+class EphemerisManager:
+    """
+    Эфемериды JPL для astropy.
+
+    EPHEMERIS — путь к локальному файлу ядра (.bsp) или имя ядра astropy ("jpl",
+    "de440s", ...), которое скачивается один раз в кэш astropy. jplephem открывает
+    ядро через mmap; при загрузке все сегменты инициализируются заранее, а прогрев
+    считает одну карту, чтобы подтянуть таблицы IERS и кэши преобразований astropy
+    до первого запроса.
+
+    Если задан EPHEMERIS_GRID_PATH, вместе с ядром открывается сетка долгот планет
+    (ephemeris_grid), и внутри её диапазона долготы берутся из неё.
+    """
+
+    def __init__(self, ephemeris: str = EPHEMERIS, iers_auto_download: bool = IERS_AUTO_DOWNLOAD):
+        self.ephemeris = ephemeris
+        self.iers_auto_download = iers_auto_download
+        self.grid: EphemerisGrid | None = None
+        self.loaded = False
+        self.ready = False
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        with self._lock:
+            if self.loaded:
+                return
+            iers.conf.auto_download = self.iers_auto_download
+            solar_system_ephemeris.set(self.ephemeris)
+            for segment in solar_system_ephemeris.kernel.segments:
+                segment.compute((segment.start_jd + segment.end_jd) / 2)
+            self.grid = load_grid()
+            self.loaded = True
+
+    def ensure_loaded(self) -> None:
+        if not self.loaded:
+            self.load()
+
+    def warm_up(self) -> None:
+        self.load()
+        time = Time(WARM_UP_TIME)
+        location = EarthLocation(lat=0 * u.deg, lon=0 * u.deg, height=0 * u.m)
+        get_body("moon", time, location).transform_to(GeocentricTrueEcliptic(equinox=time))
+        calculate_ascendants(time, location.lon.degree)
+        self.ready = True
+
+
+ephemeris = EphemerisManager()
+
+
+def warm_up_worker() -> bool:
+    ephemeris.warm_up()
+    return ephemeris.ready
@@ -0,0 +1,126 @@
+"""
+Сетка эфемерид: геоцентрические эклиптические долготы планет, заранее посчитанные
+astropy на равномерной сетке моментов (шкала TT). Долготы хранятся развёрнутыми
+(без скачков 360 -> 0) в .npy, который открывается через mmap, поэтому страницы
+файла делят все процессы через кэш ОС. Между узлами долгота интерполируется
+кубическим многочленом Лагранжа по четырём соседним узлам.
+
+Строится сетка в zodiac.services.ephemeris_grid_builder.
+"""
+
+import json
+import warnings
+
+from pathlib import Path
+
+import numpy as np
+
+from astropy.time import Time
+
+from zodiac.config import (
+    EPHEMERIS,
+    EPHEMERIS_GRID_MAX_ERROR,
+    EPHEMERIS_GRID_PATH,
+)
+
+
+# Узлы интерполяции относительно узла слева от момента
+NODES = np.arange(-1, 3)
+
+
+def metadata_path(path: Path) -> Path:
+    return path.with_suffix(".json")
+
+
+class EphemerisGrid:
+    """
+    Долготы bodies (массив формы (моменты, тела)) в моменты start + k * step,
+    start и step — в юлианских днях TT.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        start: float,
+        step: float,
+        bodies: list[str],
+        max_error: float | None = None,
+    ):
+        self.values = values
+        self.start = start
+        self.step = step
+        self.bodies = bodies
+        self.max_error = max_error  # Проверенная ошибка в угловых секундах
+
+    @classmethod
+    def load(cls, path: Path) -> "EphemerisGrid":
+        metadata = json.loads(metadata_path(path).read_text())
+        return cls(
+            np.load(path, mmap_mode="r"),
+            metadata["start"],
+            metadata["step"],
+            metadata["bodies"],
+            metadata["max_error"],
+        )
+
+    def save(self, path: Path) -> None:
+        np.save(path, np.ascontiguousarray(self.values))
+        metadata = {
+            "start": self.start,
+            "step": self.step,
+            "bodies": self.bodies,
+            "max_error": self.max_error,
+            "ephemeris": EPHEMERIS,
+        }
+        metadata_path(path).write_text(json.dumps(metadata, ensure_ascii=False, indent=2))
+
+    @property
+    def end(self) -> float:
+        return self.start + (len(self.values) - 1) * self.step
+
+    def longitudes(self, time: Time) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Долготы формы (len(bodies), *time.shape) и маска моментов, покрытых сеткой;
+        для непокрытых моментов долготы — NaN.
+        """
+        tt = time.tt
+        jd1 = np.ravel(tt.jd1)
+        jd2 = np.ravel(tt.jd2)
+        position = ((jd1 - self.start) + jd2) / self.step
+        left = np.floor(position).astype(np.int64)
+        covered = (left + NODES[0] >= 0) & (left + NODES[-1] < len(self.values))
+        left = np.where(covered, left, -NODES[0])
+        f = (position - left)[:, None]
+        weights = (
+            -f * (f - 1) * (f - 2) / 6,
+            (f + 1) * (f - 1) * (f - 2) / 2,
+            -(f + 1) * f * (f - 2) / 2,
+            (f + 1) * f * (f - 1) / 6,
+        )
+        degrees = sum(weight * self.values[left + node] for weight, node in zip(weights, NODES))
+        degrees = np.where(covered[:, None], degrees % 360, np.nan)
+        return degrees.T.reshape(len(self.bodies), *time.shape), covered.reshape(time.shape)
+
+
+def load_grid(
+    path: str = EPHEMERIS_GRID_PATH, max_error: float = EPHEMERIS_GRID_MAX_ERROR
+) -> EphemerisGrid | None:
+    """
+    Сетка из path или None, если путь не задан, файла нет или проверенная ошибка
+    сетки больше max_error угловых секунд.
+    """
+    if not path:
+        return None
+    try:
+        grid = EphemerisGrid.load(Path(path))
+    except (OSError, ValueError, KeyError) as error:
+        warnings.warn(f"Ephemeris grid {path} is not loaded: {error}", stacklevel=2)
+        return None
+    if grid.max_error is None or grid.max_error > max_error:
+        warnings.warn(
+            f"Ephemeris grid {path} error {grid.max_error} arcsec exceeds {max_error} arcsec, "
+            "falling back to astropy",
+            stacklevel=2,
+        )
+        return None
+    return grid
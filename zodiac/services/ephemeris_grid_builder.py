@@ -0,0 +1,97 @@
+"""
+Построение сетки эфемерид: python -m zodiac.services.ephemeris_grid_builder [путь]
+
+Считает долготы планет через astropy в диапазоне EPHEMERIS_GRID_START..END с шагом
+EPHEMERIS_GRID_STEP часов (см. zodiac.services.ephemeris_grid).
+
+Построение сверяет сетку с astropy в случайных моментах и местах и сохраняет
+файл, только если максимальная ошибка не больше EPHEMERIS_GRID_MAX_ERROR угловых
+секунд; эта ошибка записывается в метаданные (файл .json рядом с .npy). Она
+больше всего в часы, когда планета проходит за Солнцем: там отклонение света Солнцем
+в astropy меняется на угловые секунды за час, и кубика его не повторяет.
+"""
+
+import sys
+import time
+
+from pathlib import Path
+
+import astropy.units as u
+import numpy as np
+
+from astropy.coordinates import EarthLocation
+from astropy.time import Time
+
+from zodiac.config import (
+    EPHEMERIS_GRID_END,
+    EPHEMERIS_GRID_MAX_ERROR,
+    EPHEMERIS_GRID_PATH,
+    EPHEMERIS_GRID_START,
+    EPHEMERIS_GRID_STEP,
+)
+from zodiac.services.astrology import PLANET_NAMES, calculate_ecliptic_longitudes_astropy
+from zodiac.services.ephemeris_grid import NODES, EphemerisGrid
+
+
+def build_grid(start: Time, end: Time, step_hours: float, chunk: int = 2000) -> EphemerisGrid:
+    """
+    Считает долготы PLANET_NAMES через astropy с запасом в узел до start и два после end.
+    """
+    step = step_hours / 24
+    first = start.tt.jd + NODES[0] * step
+    count = int(np.ceil((end.tt.jd - first) / step)) + NODES[-1] + 1
+    geocenter = EarthLocation.from_geocentric(0 * u.m, 0 * u.m, 0 * u.m)
+
+    values = np.empty((count, len(PLANET_NAMES)))
+    for offset in range(0, count, chunk):
+        indices = np.arange(offset, min(offset + chunk, count))
+        times = Time(first, indices * step, format="jd", scale="tt")
+        values[indices] = calculate_ecliptic_longitudes_astropy(times, geocenter).T
+        print(f"{times[-1].utc.iso[:10]}: {indices[-1] + 1}/{count}", file=sys.stderr)
+    return EphemerisGrid(np.unwrap(values, period=360, axis=0), first, step, PLANET_NAMES)
+
+
+def grid_error(grid: EphemerisGrid, samples: int = 5000, seed: int = 0) -> float:
+    """
+    Максимальное расхождение сетки с astropy в угловых секундах в случайных моментах
+    внутри сетки и случайных местах.
+    """
+    rng = np.random.default_rng(seed)
+    times = Time(
+        rng.uniform(grid.start + grid.step, grid.end - 2 * grid.step, samples),
+        format="jd",
+        scale="tt",
+    )
+    locations = EarthLocation(
+        lat=rng.uniform(-66, 66, samples) * u.deg,
+        lon=rng.uniform(-180, 180, samples) * u.deg,
+        height=np.zeros(samples) * u.m,
+    )
+    degrees, _ = grid.longitudes(times)
+    difference = degrees - calculate_ecliptic_longitudes_astropy(times, locations)
+    return float(np.abs((difference + 180) % 360 - 180).max() * 3600)
+
+
+def main(path: str) -> int:
+    if not path:
+        print(
+            "Usage: python -m zodiac.services.ephemeris_grid_builder PATH "
+            "(or set EPHEMERIS_GRID_PATH)"
+        )
+        return 2
+    started = time.monotonic()
+    grid = build_grid(Time(EPHEMERIS_GRID_START), Time(EPHEMERIS_GRID_END), EPHEMERIS_GRID_STEP)
+    grid.max_error = grid_error(grid)
+    print(
+        f"{len(grid.values)} nodes, step {EPHEMERIS_GRID_STEP} h, "
+        f"max error {grid.max_error:.3f} arcsec, {time.monotonic() - started:.0f} s"
+    )
+    if grid.max_error > EPHEMERIS_GRID_MAX_ERROR:
+        print(f"Error exceeds EPHEMERIS_GRID_MAX_ERROR={EPHEMERIS_GRID_MAX_ERROR}, not saved")
+        return 1
+    grid.save(Path(path))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1] if len(sys.argv) > 1 else EPHEMERIS_GRID_PATH))
@@ -0,0 +1,115 @@
+import asyncio
+import multiprocessing
+
+from collections.abc import Callable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException
+
+from zodiac.config import CHART_MAX_CONCURRENCY, CHART_MAX_QUEUE, CHART_WORKERS
+from zodiac.entities.dto.astro import ChartSnapshot
+from zodiac.services.astrology import AstroChart, BirthData
+from zodiac.services.ephemeris import warm_up_worker
+
+
+def build_snapshots(births: Sequence[BirthData]) -> list[ChartSnapshot]:
+    return [chart.to_snapshot() for chart in AstroChart.from_many(births)]
+
+
+class ChartExecutor:
+    """
+    Пул процессов для расчёта карт через astropy вне event loop.
+
+    Одновременно в пул отправляется не больше max_concurrency задач, ещё max_queue
+    ждут своей очереди; сверх этого запрос сразу получает 503, а не копится в памяти.
+    При workers=0 расчёт выполняется в потоке текущего процесса.
+
+    Каждый процесс пула прогревает эфемериды при старте, а warm_up поднимает
+    все процессы заранее, чтобы первый запрос не ждал загрузки ядра.
+
+    Если процесс пула падает (например, его убил OOM killer), пул становится
+    непригодным: он закрывается, ready сбрасывается, а новый пул поднимается
+    и прогревается в фоне.
+    """
+
+    def __init__(
+        self,
+        workers: int = CHART_WORKERS,
+        max_concurrency: int = CHART_MAX_CONCURRENCY,
+        max_queue: int = CHART_MAX_QUEUE,
+    ):
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._pool: Executor | None = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        self._restart: asyncio.Task | None = None
+        self.ready = False
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.workers > 0:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=warm_up_worker,
+                )
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        return self._pool
+
+    async def run[T](self, func: Callable[..., T], *args) -> T:
+        if self._waiting >= self.max_concurrency + self.max_queue:
+            raise HTTPException(status_code=503, detail="Chart calculation queue is full")
+        self._waiting += 1
+        try:
+            async with self._semaphore:
+                loop = asyncio.get_running_loop()
+                pool = self._get_pool()
+                try:
+                    return await loop.run_in_executor(pool, func, *args)
+                except BrokenProcessPool as error:
+                    self._restart_pool(pool)
+                    raise HTTPException(
+                        status_code=503, detail="Chart worker crashed, restarting the pool"
+                    ) from error
+        finally:
+            self._waiting -= 1
+
+    def _restart_pool(self, pool: Executor) -> None:
+        # Задачи, запущенные до падения, тоже получают BrokenProcessPool: пул
+        # перезапускает только первая из них
+        if pool is not self._pool:
+            return
+        pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+        self.ready = False
+        self._restart = asyncio.create_task(self.warm_up())
+
+    async def warm_up(self) -> None:
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        await asyncio.gather(
+            *(loop.run_in_executor(pool, warm_up_worker) for _ in range(max(self.workers, 1)))
+        )
+        self.ready = True
+
+    async def build_many(self, births: Sequence[BirthData]) -> list[AstroChart]:
+        if not births:
+            return []
+        snapshots = await self.run(build_snapshots, list(births))
+        return [AstroChart.from_snapshot(snapshot) for snapshot in snapshots]
+
+    def shutdown(self) -> None:
+        if self._restart is not None:
+            self._restart.cancel()
+            self._restart = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self.ready = False
+
+
+chart_executor = ChartExecutor()
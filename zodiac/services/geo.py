@@ -1,11 +1,188 @@
+import asyncio
+import csv
+import time
+
+from bisect import bisect_left
+from contextlib import suppress
+from pathlib import Path
+from typing import Protocol
+
 from fastapi import HTTPException
+from geopy.exc import GeocoderServiceError
 from geopy.geocoders import Nominatim
+from pymongo.errors import DuplicateKeyError
+
+from zodiac.config import GAZETTEER_PATH, GEOCODER_MIN_DELAY, GEO_CACHE_SIZE
+from zodiac.entities.db.city import City
+from zodiac.services.cache import LRUCache
+
+
+Coordinates = tuple[float, float]
+
+
+def normalize_city_name(city_name: str) -> str:
+    return " ".join(city_name.casefold().split())
+
+
+class Gazetteer:
+    """
+    Офлайн-справочник городов с префиксным индексом по отсортированным названиям.
+
+    Для одинаковых названий хранится самый населённый город.
+    """
+
+    def __init__(self, entries: dict[str, tuple[float, float, int]]):
+        self._entries = entries
+        self._names = sorted(entries)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @classmethod
+    def load_geonames(cls, path: Path) -> "Gazetteer":
+        """
+        Загружает дамп GeoNames (cities15000.txt, allCountries.txt и т.п.):
+        название, ASCII-название и альтернативные названия, широта, долгота, население.
+        """
+        entries: dict[str, tuple[float, float, int]] = {}
+        csv.field_size_limit(1 << 24)
+        with path.open(encoding="utf-8", newline="") as file:
+            for row in csv.reader(file, delimiter="\t", quoting=csv.QUOTE_NONE):
+                latitude, longitude = float(row[4]), float(row[5])
+                population = int(row[14] or 0)
+                for name in {row[1], row[2], *row[3].split(",")}:
+                    key = normalize_city_name(name)
+                    if key and (key not in entries or entries[key][2] < population):
+                        entries[key] = (latitude, longitude, population)
+        return cls(entries)
+
+    def lookup(self, city_name: str) -> Coordinates | None:
+        entry = self._entries.get(normalize_city_name(city_name))
+        return None if entry is None else (entry[0], entry[1])
+
+    def search(self, prefix: str, limit: int = 10) -> list[str]:
+        prefix = normalize_city_name(prefix)
+        start = bisect_left(self._names, prefix)
+        names = []
+        for name in self._names[start:]:
+            if not name.startswith(prefix) or len(names) >= limit:
+                break
+            names.append(name)
+        return names
+
+    def complete(self, city_name: str) -> Coordinates | None:
+        """
+        Координаты единственного города, название которого начинается с city_name
+        («санкт-петер» -> «санкт-петербург»); None, если таких нет или их несколько.
+        """
+        if not normalize_city_name(city_name):
+            return None
+        names = self.search(city_name, limit=2)
+        return self.lookup(names[0]) if len(names) == 1 else None
+
+
+class GeocoderBackend(Protocol):
+    name: str
+
+    async def geocode(self, city_name: str) -> Coordinates | None: ...
+
+
+class NominatimBackend:
+    name = "nominatim"
+
+    def __init__(self, user_agent: str = "astro_api", min_delay: float = GEOCODER_MIN_DELAY):
+        self._geolocator = Nominatim(user_agent=user_agent)
+        self.min_delay = min_delay
+        self._lock = asyncio.Lock()
+        self._last_request = 0.0
+
+    async def geocode(self, city_name: str) -> Coordinates | None:
+        # Nominatim допускает не больше одного запроса в секунду
+        async with self._lock:
+            delay = self._last_request + self.min_delay - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                location = await asyncio.to_thread(self._geolocator.geocode, city_name)
+            finally:
+                self._last_request = time.monotonic()
+        if not location:
+            return None
+        return location.latitude, location.longitude
+
+
+class GeoService:
+    """
+    Геокодирование городов: LRU процесса, затем коллекция City в Mongo, затем
+    офлайн-справочник (точное название, потом однозначный префикс) и только при
+    промахе — удалённый геокодер.
+    Найденные координаты сохраняются в City.
+    """
+
+    def __init__(
+        self,
+        backend: GeocoderBackend | None,
+        gazetteer_path: str = GAZETTEER_PATH,
+        cache_size: int = GEO_CACHE_SIZE,
+    ):
+        self.backend = backend
+        self.gazetteer_path = gazetteer_path
+        self._gazetteer: Gazetteer | None = None
+        self._gazetteer_lock = asyncio.Lock()
+        self._cache: LRUCache[str, Coordinates] = LRUCache(cache_size)
+
+    async def get_gazetteer(self) -> Gazetteer | None:
+        if not self.gazetteer_path:
+            return None
+        async with self._gazetteer_lock:
+            if self._gazetteer is None:
+                self._gazetteer = await asyncio.to_thread(
+                    Gazetteer.load_geonames, Path(self.gazetteer_path)
+                )
+        return self._gazetteer
+
+    async def get_coordinates(self, city_name: str) -> Coordinates:
+        key = normalize_city_name(city_name)
+        coordinates = self._cache.get(key)
+        if coordinates is not None:
+            return coordinates
+
+        city = await City.find_one(City.name == key)
+        if city:
+            coordinates = (city.latitude, city.longitude)
+        else:
+            coordinates, source = await self._resolve(city_name)
+            if coordinates is None:
+                raise HTTPException(
+                    status_code=404, detail=f"Coordinates for '{city_name}' not found."
+                )
+            with suppress(DuplicateKeyError):
+                await City(
+                    name=key, latitude=coordinates[0], longitude=coordinates[1], source=source
+                ).insert()
+
+        self._cache.set(key, coordinates)
+        return coordinates
+
+    async def _resolve(self, city_name: str) -> tuple[Coordinates | None, str]:
+        gazetteer = await self.get_gazetteer()
+        if gazetteer is not None:
+            coordinates = gazetteer.lookup(city_name) or gazetteer.complete(city_name)
+            if coordinates is not None:
+                return coordinates, "gazetteer"
+        if self.backend is not None:
+            try:
+                return await self.backend.geocode(city_name), self.backend.name
+            except (GeocoderServiceError, OSError) as e:
+                # Временный сбой геокодера — не ошибка в названии города; ничего не кэшируется
+                raise HTTPException(
+                    status_code=503, detail=f"Geocoder is unavailable, try again later: {e}"
+                )
+        return None, ""
+
 
-geolocator = Nominatim(user_agent="astro_api")
+geocoder = GeoService(NominatimBackend())
 
 
-def get_coordinates_by_city_name(city_name: str):
-    location = geolocator.geocode(city_name)
-    if not location:
-        raise HTTPException(status_code=404, detail=f"Coordinates for '{city_name}' not found.")
-    return location.latitude, location.longitude
+async def get_coordinates_by_city_name(city_name: str) -> Coordinates:
+    return await geocoder.get_coordinates(city_name)
@@ -0,0 +1,106 @@
+import sys
+
+import astropy.units as u
+import erfa
+import numpy as np
+
+from astropy.coordinates import AltAz, EarthLocation, GeocentricTrueEcliptic, SkyCoord
+from astropy.time import Time
+from astropy.utils import iers
+
+
+# Допустимое расхождение аналитического асцендента с astropy, угловые секунды
+MAX_ASCENDANT_ERROR = 1.0
+
+
+def delta_ut1_utc(time: Time) -> np.ndarray:
+    """
+    UT1-UTC в секундах; вне диапазона таблиц IERS — ноль, как и в преобразованиях astropy.
+    """
+    table = iers.earth_orientation_table.get()
+    dut1, status = table.ut1_utc(time.utc, return_status=True)
+    return np.where(np.asarray(status) >= 0, dut1.to_value(u.s), 0.0)
+
+
+def local_sidereal_times(time: Time, longitude: np.ndarray) -> np.ndarray:
+    """
+    Местное истинное звёздное время в радианах (GMST IAU 2006 + уравнение равноденствий
+    IAU 2000B).
+    """
+    utc = time.utc
+    tt = time.tt
+    ut1_jd1, ut1_jd2 = erfa.utcut1(utc.jd1, utc.jd2, delta_ut1_utc(time))
+    gmst = erfa.gmst06(ut1_jd1, ut1_jd2, tt.jd1, tt.jd2)
+    return gmst + erfa.ee00b(tt.jd1, tt.jd2) + np.radians(longitude)
+
+
+def true_obliquities(time: Time) -> np.ndarray:
+    """
+    Истинный наклон эклиптики в радианах (средний IAU 2006 + нутация IAU 2000B).
+    """
+    tt = time.tt
+    _, nutation = erfa.nut00b(tt.jd1, tt.jd2)
+    return erfa.obl06(tt.jd1, tt.jd2) + nutation
+
+
+def calculate_ascendants(time: Time, longitude: np.ndarray) -> np.ndarray:
+    """
+    Асцендент карты аналитически, без преобразований систем координат astropy.
+
+    Асцендентом здесь, как и раньше, считается эклиптическая долгота точки востока
+    на горизонте (az=90°, alt=0°). Эта точка лежит на истинном экваторе с прямым
+    восхождением LST + 90°, поэтому от широты результат не зависит и нужна только
+    географическая долгота в градусах. Работает для массивов моментов и мест.
+    """
+    right_ascension = local_sidereal_times(time, longitude) + np.pi / 2
+    longitude = np.arctan2(
+        np.sin(right_ascension) * np.cos(true_obliquities(time)), np.cos(right_ascension)
+    )
+    return np.degrees(longitude) % 360
+
+
+def calculate_ascendants_astropy(time: Time, location: EarthLocation) -> np.ndarray:
+    """
+    Эталонный расчёт асцендента через AltAz -> ICRS -> GeocentricTrueEcliptic.
+    """
+    altaz_frame = AltAz(obstime=time, location=location)
+    east = SkyCoord(
+        az=np.full(time.shape, 90.0) * u.deg,
+        alt=np.zeros(time.shape) * u.deg,
+        frame=altaz_frame,
+    )
+    equatorial = east.transform_to("icrs")
+    ecliptic = equatorial.transform_to(GeocentricTrueEcliptic(equinox=time))
+    return ecliptic.lon.degree % 360
+
+
+def equal_house_cusps(ascendants: np.ndarray) -> np.ndarray:
+    """
+    Куспиды 12 равных домов формы (*ascendants.shape, 12).
+    """
+    return (np.asarray(ascendants)[..., None] + 30.0 * np.arange(12)) % 360
+
+
+def max_ascendant_error(time: Time, location: EarthLocation) -> float:
+    """
+    Максимальное расхождение аналитического асцендента с эталоном astropy в угловых секундах.
+    """
+    analytic = calculate_ascendants(time, location.lon.degree)
+    difference = analytic - calculate_ascendants_astropy(time, location)
+    return float(np.abs((difference + 180) % 360 - 180).max() * 3600)
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    samples = 500
+    times = Time(rng.uniform(Time("1940-01-01").jd, Time("2025-01-01").jd, samples), format="jd")
+    locations = EarthLocation(
+        lat=rng.uniform(-66, 66, samples) * u.deg,
+        lon=rng.uniform(-180, 180, samples) * u.deg,
+        height=np.zeros(samples) * u.m,
+    )
+    # Эталон astropy обнуляет UT1-UTC для всего массива, если хоть один момент вне IERS,
+    # поэтому сверяем по одному моменту.
+    error = max(max_ascendant_error(times[i], locations[i]) for i in range(samples))
+    print(f"Max ascendant error: {error:.3f} arcsec (limit {MAX_ASCENDANT_ERROR} arcsec)")
+    sys.exit(1 if error > MAX_ASCENDANT_ERROR else 0)
@@ -0,0 +1,179 @@
+import codecs
+import csv
+
+from collections.abc import AsyncIterator, Sequence
+from enum import StrEnum
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+
+from zodiac.config import IMPORT_BATCH_SIZE, IMPORT_MAX_ERRORS
+from zodiac.entities.db.employee import Employee
+from zodiac.entities.db.team import Team
+from zodiac.entities.dto.member import AddMemberRequest, ImportProgress, ImportRowError
+from zodiac.services import team_compatibility
+from zodiac.services.astrology import BirthData
+from zodiac.services.candidates import candidate_search
+from zodiac.services.chart_cache import chart_cache
+from zodiac.services.geo import Coordinates, get_coordinates_by_city_name
+from zodiac.services.traits import personal_traits
+
+
+class ImportFormat(StrEnum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+    @classmethod
+    def from_content_type(cls, content_type: str) -> "ImportFormat":
+        return cls.CSV if "csv" in content_type else cls.NDJSON
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_members(
+    lines: AsyncIterator[str], fmt: ImportFormat
+) -> AsyncIterator[tuple[int, AddMemberRequest | ImportRowError]]:
+    """
+    Разбирает строки CSV (с заголовком, birthPlace — название города) или NDJSON
+    (объекты как в POST /members/{team_id}/create) в AddMemberRequest.
+    """
+    header: list[str] | None = None
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            if fmt == ImportFormat.NDJSON:
+                member = AddMemberRequest.model_validate_json(line)
+            elif header is None:
+                header = next(csv.reader([line]))
+                continue
+            else:
+                row = dict(zip(header, next(csv.reader([line]))))
+                row["birthPlace"] = {"name": row.pop("birthPlace", "")}
+                member = AddMemberRequest.model_validate(row)
+        except (ValidationError, ValueError) as e:
+            yield line_number, ImportRowError(line=line_number, message=str(e))
+        else:
+            yield line_number, member
+
+
+def add_error(progress: ImportProgress, error: ImportRowError) -> None:
+    progress.failed += 1
+    if len(progress.errors) < IMPORT_MAX_ERRORS:
+        progress.errors.append(error)
+
+
+async def geocode_cities(cities: set[str]) -> tuple[dict[str, Coordinates], dict[str, str]]:
+    """
+    Координаты городов и сообщения об ошибках для тех, что не удалось геокодировать.
+    Сбой геокодера (503) относится только к своему городу и не прерывает импорт;
+    сообщение отличает его от неизвестного города (404), строку можно повторить позже.
+    """
+    coordinates, errors = {}, {}
+    for city in cities:
+        try:
+            coordinates[city] = await get_coordinates_by_city_name(city)
+        except HTTPException as e:
+            if e.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+                errors[city] = f"Geocoding '{city}' failed: {e.detail}"
+            else:
+                errors[city] = e.detail
+    return coordinates, errors
+
+
+async def import_batch(
+    team: Team, batch: Sequence[tuple[int, AddMemberRequest]], progress: ImportProgress
+) -> None:
+    coordinates, errors = await geocode_cities({member.birth_place.name for _, member in batch})
+    members = []
+    for line_number, member in batch:
+        city = member.birth_place.name
+        if city not in coordinates:
+            add_error(progress, ImportRowError(line=line_number, message=errors[city]))
+            continue
+        member.birth_place.latitude, member.birth_place.longitude = coordinates[city]
+        members.append(member)
+    if not members:
+        return
+
+    charts = await chart_cache.build_many([
+        BirthData(
+            birth_time=member.birth_date,
+            latitude=member.birth_place.latitude,
+            longitude=member.birth_place.longitude,
+        )
+        for member in members
+    ])
+    employees = [
+        Employee(
+            full_name=member.full_name,
+            birth_date=member.birth_date,
+            birth_place=member.birth_place,
+            email=member.email,
+            phone=member.phone,
+            position=member.position,
+            personal_traits=traits,
+            chart=chart.to_snapshot(),
+            role=member.role,
+            team=team,
+        )
+        for member, chart, traits in zip(members, charts, personal_traits(charts))
+    ]
+    result = await Employee.insert_many(employees)
+    # insert_many в beanie вставляет копии документов и не проставляет id исходным
+    for employee, inserted_id in zip(employees, result.inserted_ids):
+        employee.id = inserted_id
+    await candidate_search.add(employees, charts)
+    progress.imported += len(members)
+
+
+async def import_members(
+    team: Team,
+    chunks: AsyncIterator[bytes],
+    fmt: ImportFormat,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> AsyncIterator[ImportProgress]:
+    """
+    Потоковый импорт участников в команду.
+
+    Строки читаются по мере поступления и обрабатываются пачками: города
+    геокодируются один раз на пачку, карты считаются одним заданием пула,
+    сотрудники вставляются через insert_many. Суммы совместимости команды
+    пересчитываются одним обновлением в конце. После каждой пачки отдаётся
+    текущий прогресс.
+    """
+    progress = ImportProgress()
+    batch: list[tuple[int, AddMemberRequest]] = []
+    try:
+        async for line_number, member in iter_members(iter_lines(chunks), fmt):
+            progress.processed += 1
+            if isinstance(member, ImportRowError):
+                add_error(progress, member)
+                continue
+            batch.append((line_number, member))
+            if len(batch) >= batch_size:
+                await import_batch(team, batch, progress)
+                batch = []
+                yield progress.model_copy(deep=True)
+
+        if batch:
+            await import_batch(team, batch, progress)
+    finally:
+        # Уже вставленные пачки учитываются в суммах команды, даже если импорт прерван
+        if progress.imported:
+            await team_compatibility.rebuild(team)
+    progress.done = True
+    yield progress
@@ -0,0 +1,73 @@
+import base64
+import binascii
+import json
+
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from beanie import PydanticObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+
+from zodiac.config import PAGE_SIZE_LIMIT
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Cursor(NamedTuple):
+    """
+    Позиция в выдаче, отсортированной по (created_at, _id). Клиенту отдаётся
+    непрозрачной строкой; страница по курсору стоит столько же, сколько первая.
+    """
+
+    created_at: datetime
+    id: PydanticObjectId
+
+    def encode(self) -> str:
+        payload = json.dumps([self.created_at.isoformat(), str(self.id)]).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "Cursor":
+        try:
+            payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            created_at, id_ = json.loads(payload)
+            return cls(datetime.fromisoformat(created_at), PydanticObjectId(id_))
+        except (binascii.Error, InvalidId, TypeError, ValueError) as e:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+    @classmethod
+    def of(cls, document: Any) -> "Cursor":
+        return cls(document.created_at, document.id)
+
+    def after(self) -> dict:
+        """
+        Фильтр Mongo для документов строго после курсора.
+        """
+        return {
+            "$or": [
+                {"created_at": {"$gt": self.created_at}},
+                {"created_at": self.created_at, "_id": {"$gt": self.id}},
+            ]
+        }
+
+
+class Page[T](NamedTuple):
+    items: list[T]
+    next_cursor: str | None
+
+
+def page_size(limit: int) -> int:
+    return min(max(limit, 1), PAGE_SIZE_LIMIT)
+
+
+def make_page[T](items: list[T], limit: int) -> Page[T]:
+    """
+    Страница из limit + 1 прочитанных элементов: лишний лишь показывает, что дальше
+    есть ещё.
+    """
+    if len(items) <= limit:
+        return Page(items, None)
+    items = items[:limit]
+    return Page(items, Cursor.of(items[-1]).encode())
@@ -0,0 +1,72 @@
+import asyncio
+
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from zodiac.config import BCRYPT_ROUNDS, PASSWORD_HASH_MAX_QUEUE, PASSWORD_HASH_WORKERS
+
+
+class PasswordHasher:
+    """
+    bcrypt вне event loop: хэширование и проверка выполняются в пуле из workers
+    потоков (bcrypt отпускает GIL на время расчёта), ещё max_queue операций ждут
+    своей очереди; сверх этого запрос сразу получает 503, чтобы всплеск входов
+    не копился в памяти.
+
+    Стоимость задаёт rounds. Хэш с другой стоимостью считается устаревшим:
+    verify возвращает вместо него новый, который нужно сохранить.
+    """
+
+    def __init__(
+        self,
+        rounds: int = BCRYPT_ROUNDS,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_queue: int = PASSWORD_HASH_MAX_QUEUE,
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._context = CryptContext(
+            schemes=["bcrypt"],
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds,
+        )
+        self._pool: ThreadPoolExecutor | None = None
+        self._waiting = 0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hasher"
+            )
+        return self._pool
+
+    async def _run[T](self, func: Callable[..., T], *args) -> T:
+        if self._waiting >= self.workers + self.max_queue:
+            raise HTTPException(status_code=503, detail="Too many authentication requests")
+        self._waiting += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), func, *args)
+        finally:
+            self._waiting -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self._context.hash, password)
+
+    async def verify(self, password: str, password_hash: str) -> tuple[bool, str | None]:
+        """
+        (пароль верен, новый хэш, если сохранённый посчитан с другой стоимостью).
+        """
+        return await self._run(self._context.verify_and_update, password, password_hash)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,91 @@
+from beanie import PydanticObjectId
+
+from zodiac.entities.db.employee import Employee, EmployeeChart
+from zodiac.entities.db.team import Team, TeamSummary
+from zodiac.entities.enums.roles import Role
+from zodiac.services.pagination import Cursor, Page, make_page, page_size
+
+
+async def list_team_summaries(
+    limit: int, cursor: Cursor | None = None, offset: int = 0
+) -> Page[TeamSummary]:
+    """
+    Страница команд с числом сотрудников и заявителей — одним aggregate,
+    без загрузки документов участников.
+
+    Команды упорядочены по (created_at, _id); страница после cursor читается по
+    индексу с того же места, что и первая. offset оставлен для старых клиентов.
+    """
+    limit = page_size(limit)
+    pipeline = [
+        *([{"$match": cursor.after()}] if cursor else []),
+        {"$sort": {"created_at": 1, "_id": 1}},
+        *([{"$skip": offset}] if offset > 0 else []),
+        {"$limit": limit + 1},
+        {"$project": {"name": 1, "description": 1, "created_at": 1}},
+        {
+            "$lookup": {
+                "from": Employee.get_collection_name(),
+                "localField": "_id",
+                "foreignField": "team.$id",
+                "pipeline": [{"$group": {"_id": "$role", "count": {"$sum": 1}}}],
+                "as": "counts",
+            }
+        },
+    ]
+    summaries = []
+    async for document in Team.aggregate(pipeline):
+        counts = {group["_id"]: group["count"] for group in document.pop("counts")}
+        summaries.append(
+            TeamSummary(
+                **document,
+                employees_count=counts.get(Role.EMPLOYEE.value, 0),
+                applicants_count=counts.get(Role.PENDING.value, 0),
+            )
+        )
+    return make_page(summaries, limit)
+
+
+async def list_team_members(
+    team_id: PydanticObjectId, role: Role, limit: int, cursor: Cursor | None = None
+) -> Page[Employee]:
+    """
+    Страница участников команды с ролью role в порядке (created_at, _id).
+    """
+    limit = page_size(limit)
+    query = Employee.find(Employee.team.id == team_id, Employee.role == role)
+    if cursor:
+        query = query.find(cursor.after())
+    members = await query.sort(+Employee.created_at, +Employee.id).limit(limit + 1).to_list()
+    return make_page(members, limit)
+
+
+async def get_member_with_team_charts(
+    member_id: PydanticObjectId,
+) -> tuple[Employee, list[EmployeeChart]] | None:
+    """
+    Сотрудник и проекции EmployeeChart всех участников его команды (включая его самого)
+    одним aggregate с $lookup.
+    """
+    pipeline = [
+        {"$match": {"_id": member_id}},
+        {
+            "$lookup": {
+                "from": Employee.get_collection_name(),
+                "localField": "team.$id",
+                "foreignField": "team.$id",
+                "pipeline": [
+                    # Без команды localField пуст и совпал бы со всеми сотрудниками без команды
+                    {"$match": {"team": {"$ne": None}}},
+                    {"$project": {"birth_date": 1, "birth_place": 1, "chart": 1}},
+                ],
+                "as": "team_charts",
+            }
+        },
+    ]
+    documents = await Employee.aggregate(pipeline).to_list()
+    if not documents:
+        return None
+    document = documents[0]
+    team_charts = [EmployeeChart.model_validate(chart) for chart in document.pop("team_charts")]
+    return Employee.model_validate(document), team_charts
@@ -0,0 +1,76 @@
+import re
+import warnings
+
+from pathlib import Path
+from secrets import token_urlsafe
+
+import jwt
+
+from zodiac.config import JWT_ACTIVE_KEY, JWT_ALGORITHM, JWT_KEYS, JWT_KEYS_FILE
+
+
+def parse_keys(spec: str) -> dict[str, str]:
+    """
+    Ключи в виде "kid:secret", через запятую или по одному на строке;
+    строки, начинающиеся с #, пропускаются.
+    """
+    keys = {}
+    for entry in re.split(r"[,\n]", spec):
+        entry = entry.strip()
+        if not entry or entry.startswith("#"):
+            continue
+        kid, _, secret = entry.partition(":")
+        if not kid.strip() or not secret.strip():
+            raise ValueError("JWT key must look like 'kid:secret'")
+        keys[kid.strip()] = secret.strip()
+    return keys
+
+
+class SigningKeys:
+    """
+    Ключи подписи JWT с идентификаторами (kid в заголовке токена).
+
+    Токены подписываются активным ключом, а проверяются любым известным, поэтому
+    ротация — это добавить новый ключ и сделать его активным, а старый удалить,
+    когда истекут подписанные им токены. Все процессы и контейнеры должны получать
+    одинаковый набор ключей.
+    """
+
+    def __init__(self, keys: dict[str, str], active: str = "", algorithm: str = JWT_ALGORITHM):
+        if not keys:
+            raise ValueError("At least one JWT signing key is required")
+        self.keys = keys
+        self.active = active or next(iter(keys))
+        if self.active not in keys:
+            raise ValueError(f"Active JWT key {self.active!r} is not configured")
+        self.algorithm = algorithm
+
+    @classmethod
+    def from_config(cls) -> "SigningKeys":
+        keys = parse_keys(JWT_KEYS)
+        if JWT_KEYS_FILE:
+            keys |= parse_keys(Path(JWT_KEYS_FILE).read_text())
+        if not keys:
+            warnings.warn(
+                "JWT_KEYS is not set: using a random key for this process only, "
+                "tokens will not survive a restart or work across workers",
+                stacklevel=2,
+            )
+            keys = {"ephemeral": token_urlsafe(32)}
+        return cls(keys, JWT_ACTIVE_KEY)
+
+    def encode(self, payload: dict) -> str:
+        return jwt.encode(
+            payload, self.keys[self.active], algorithm=self.algorithm, headers={"kid": self.active}
+        )
+
+    def decode(self, token: str) -> dict:
+        # Токен без kid проверяется активным ключом
+        kid = jwt.get_unverified_header(token).get("kid", self.active)
+        secret = self.keys.get(kid)
+        if secret is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key {kid!r}")
+        return jwt.decode(token, secret, algorithms=[self.algorithm])
+
+
+signing_keys = SigningKeys.from_config()
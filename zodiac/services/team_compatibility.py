@@ -0,0 +1,211 @@
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+from beanie import PydanticObjectId
+from beanie.odm.queries.find import FindOne
+from beanie.operators import In, Inc, Set, Unset
+
+from zodiac.entities.db.employee import Employee, EmployeeChart
+from zodiac.entities.db.team import Team
+from zodiac.entities.dto.astro import CompatibilityTraits
+from zodiac.services.astrology import AstroChart
+from zodiac.services.chart_cache import chart_cache
+from zodiac.services.compatibility import (
+    COMPATIBILITY_FIELDS,
+    compatibility_matrix,
+    longitude_matrix,
+    to_traits,
+)
+
+
+# Попыток условного обновления Team при конкурентных изменениях
+UPDATE_ATTEMPTS = 10
+
+
+def average_compatibility(totals: Sequence[float], count: int) -> CompatibilityTraits:
+    """
+    Средняя совместимость по суммам Team.compatibility, как в calculate_group_compatibility.
+    """
+    if count == 0:
+        return CompatibilityTraits(**dict.fromkeys(COMPATIBILITY_FIELDS, 0.0))
+    return to_traits(np.asarray(totals) / count)
+
+
+def calculate_totals(charts: Mapping[str, AstroChart]) -> dict[str, list[float]]:
+    scores = compatibility_matrix(longitude_matrix(list(charts.values())))
+    diagonal = np.arange(len(charts))
+    scores[diagonal, diagonal] = 0
+    return dict(zip(charts, scores.sum(axis=1).tolist()))
+
+
+async def group_compatibilities(
+    team: Team, members: Sequence[Employee]
+) -> dict[str, CompatibilityTraits]:
+    """
+    Групповая совместимость каждого участника с остальными за O(N).
+
+    Если суммы в Team.compatibility не соответствуют составу команды (например,
+    команда создана до их появления), они пересчитываются целиком и сохраняются;
+    members должны быть прочитаны вместе с team. Если сохранить суммы для этого
+    состава не удалось (он уже изменился), они считаются в памяти, а team.version
+    остаётся версией этого чтения.
+    """
+    member_ids = [str(member.id) for member in members]
+    if set(team.compatibility) != set(member_ids):
+        await rebuild(team, members)
+    totals = team.compatibility
+    if set(totals) != set(member_ids):
+        totals = calculate_totals(dict(zip(member_ids, await chart_cache.get_many(members))))
+    return {
+        member_id: average_compatibility(totals[member_id], len(member_ids) - 1)
+        for member_id in member_ids
+    }
+
+
+async def touch(team: Team) -> None:
+    """
+    Увеличивает Team.version без изменения сумм: состав команды изменился, но
+    суммы уже учитывают это (или будут пересчитаны при чтении).
+    """
+    await Team.find_one(Team.id == team.id).update(Inc({Team.version: 1}))
+
+
+def _unchanged_since(team: Team, version: int) -> FindOne[Team]:
+    # У команд, созданных до появления Team.version, поля нет вовсе
+    versions = [0, None] if version == 0 else [version]
+    return Team.find_one(Team.id == team.id, In(Team.version, versions))
+
+
+async def _charts_of(member_ids: Sequence[str]) -> dict[str, AstroChart]:
+    if not member_ids:
+        return {}
+    members = (
+        await Employee
+        .find(In(Employee.id, [PydanticObjectId(member_id) for member_id in member_ids]))
+        .project(EmployeeChart)
+        .to_list()
+    )
+    charts = await chart_cache.get_many(members)
+    return {str(member.id): chart for member, chart in zip(members, charts)}
+
+
+async def _load_charts(
+    loaded: dict[str, AstroChart], member_ids: Sequence[str]
+) -> dict[str, AstroChart]:
+    """
+    Карты member_ids; из Mongo читаются только те, которых ещё нет в loaded.
+    Между попытками условного обновления состав команды обычно не меняется,
+    поэтому повтор перечитывает лишь документ команды.
+    """
+    loaded.update(await _charts_of([key for key in member_ids if key not in loaded]))
+    return {key: loaded[key] for key in member_ids if key in loaded}
+
+
+async def rebuild(team: Team, members: Sequence[Employee] | None = None) -> None:
+    """
+    Пересчитывает суммы Team.compatibility по всему составу команды одним обновлением.
+
+    members, если переданы, должны быть прочитаны вместе с team (Team.get с
+    fetch_links): обновление применяется, только если Team.version не изменилась с
+    того же чтения, иначе суммы старого состава легли бы под новую версию. При
+    повторе команда и участники перечитываются вместе. team.compatibility и
+    team.version обновляются, только если сохранены суммы именно для members.
+    """
+    version = team.version
+    own = members is not None
+    for _ in range(UPDATE_ATTEMPTS):
+        if members is None:
+            current = await Team.get(team.id, fetch_links=True)
+            version, members = current.version, current.employees or []
+        charts = await chart_cache.get_many(members)
+        totals = calculate_totals({str(member.id): chart for member, chart in zip(members, charts)})
+        result = await _unchanged_since(team, version).update(
+            Set({Team.compatibility: totals}), Inc({Team.version: 1})
+        )
+        if result.modified_count:
+            if own:
+                team.compatibility, team.version = totals, version + 1
+            return
+        # Состав мог измениться, перечитываем команду вместе с участниками
+        members, own = None, False
+
+
+async def add_member(team: Team, member_id: str, chart: AstroChart) -> None:
+    """
+    Добавляет в суммы команды новые пары с участником member_id: O(N) вычислений и
+    одно атомарное обновление документа команды.
+
+    Пары считаются только с участниками, уже учтёнными в суммах (ключи
+    Team.compatibility), а обновление применяется, только если Team.version не
+    изменилась с момента чтения; иначе попытка повторяется. Так одновременные
+    добавления в одну команду не теряют и не удваивают пары. Если все попытки
+    исчерпаны, участник остаётся не учтённым, и суммы пересчитает
+    group_compatibilities при следующем чтении команды. Если участник уже учтён
+    (его учёл rebuild, который сам увеличил версию), ничего не делает.
+    """
+    loaded: dict[str, AstroChart] = {}
+    own = longitude_matrix([chart])
+    for _ in range(UPDATE_ATTEMPTS):
+        current = await Team.get(team.id)
+        if member_id in current.compatibility:
+            return
+        others = await _load_charts(loaded, list(current.compatibility))
+
+        own_totals = [0.0] * len(COMPATIBILITY_FIELDS)
+        increments = {}
+        if others:
+            other_longitudes = longitude_matrix(list(others.values()))
+            own_totals = compatibility_matrix(own, other_longitudes)[0].sum(axis=0).tolist()
+            backward = compatibility_matrix(other_longitudes, own)[:, 0]
+            increments = {
+                f"compatibility.{other_id}.{k}": value
+                for other_id, scores in zip(others, backward.tolist())
+                for k, value in enumerate(scores)
+            }
+
+        result = await _unchanged_since(team, current.version).update(
+            Set({f"compatibility.{member_id}": own_totals}),
+            Inc({**increments, "version": 1}),
+        )
+        if result.modified_count:
+            return
+    await touch(team)
+
+
+async def remove_member(team_id: PydanticObjectId, member_id: str, chart: AstroChart) -> None:
+    """
+    Вычитает из сумм команды team_id пары с участником member_id; применяется так же
+    условно по Team.version, как add_member. Документ команды читается здесь, поэтому
+    вызывающему достаточно ссылки на команду.
+    """
+    loaded: dict[str, AstroChart] = {}
+    own = longitude_matrix([chart])
+    for _ in range(UPDATE_ATTEMPTS):
+        current = await Team.get(team_id)
+        if current is None:
+            return
+        if member_id not in current.compatibility:
+            # Участник не был учтён в суммах, но состав изменился: версию всё равно увеличиваем
+            break
+        others = await _load_charts(
+            loaded, [key for key in current.compatibility if key != member_id]
+        )
+
+        decrements = {}
+        if others:
+            other_longitudes = longitude_matrix(list(others.values()))
+            backward = compatibility_matrix(other_longitudes, own)[:, 0]
+            decrements = {
+                f"compatibility.{other_id}.{k}": -value
+                for other_id, scores in zip(others, backward.tolist())
+                for k, value in enumerate(scores)
+            }
+
+        result = await _unchanged_since(current, current.version).update(
+            Unset({f"compatibility.{member_id}": ""}),
+            Inc({**decrements, "version": 1}),
+        )
+        if result.modified_count:
+            return
+    await touch(current)
@@ -0,0 +1,251 @@
+import asyncio
+import math
+import time
+
+from itertools import combinations, islice
+from typing import NamedTuple
+
+import numpy as np
+
+from beanie import PydanticObjectId
+
+from zodiac.config import (
+    OPTIMIZER_BALANCE_WEIGHT,
+    OPTIMIZER_EXHAUSTIVE_LIMIT,
+    OPTIMIZER_MAX_POOL,
+    OPTIMIZER_MAX_TIME_BUDGET,
+    OPTIMIZER_TIME_BUDGET,
+)
+from zodiac.entities.db.employee import Employee
+from zodiac.entities.dto.astro import CompatibilityTraits, PersonalTraits
+from zodiac.entities.enums.roles import Role
+from zodiac.services.chart_cache import chart_cache
+from zodiac.services.compatibility import compatibility_matrix, longitude_matrix, to_traits
+from zodiac.services.traits import TRAIT_FIELDS, to_personal_traits
+
+
+class TeamSelection(NamedTuple):
+    members: list[int]  # Индексы кандидатов в пуле
+    mean_score: float
+    balance: float
+    objective: float
+    exhaustive: bool
+
+
+def pairwise_scores(longitudes: np.ndarray, block: int = 256) -> np.ndarray:
+    """
+    Симметричная матрица (N, N) взаимной совместимости: среднее mean_score пары в обе
+    стороны, на диагонали нули. Считается блоками строк, чтобы не держать в памяти
+    полный массив (N, N, 5).
+    """
+    count = len(longitudes)
+    scores = np.empty((count, count), dtype=np.float32)
+    for start in range(0, count, block):
+        stop = min(start + block, count)
+        scores[start:stop] = compatibility_matrix(longitudes[start:stop], longitudes).mean(axis=-1)
+    scores = (scores + scores.T) / 2
+    np.fill_diagonal(scores, 0)
+    return scores
+
+
+def trait_balance(profiles: np.ndarray) -> np.ndarray:
+    """
+    Сбалансированность средних личных качеств команды по 100-балльной шкале:
+    100 — все качества поровну, 0 — всё в одном качестве.
+    """
+    even = 100 / len(TRAIT_FIELDS)
+    worst = 2 * (100 - even)
+    return np.clip(100 * (1 - np.abs(profiles - even).sum(axis=-1) / worst), 0, 100)
+
+
+class TeamOptimizer:
+    """
+    Подбор K участников из пула, максимизирующий
+    (1 - balance_weight) * средняя взаимная совместимость + balance_weight * баланс качеств.
+
+    Небольшие пулы перебираются полностью. Для остальных — жадное построение и
+    локальный поиск обменами (участник <-> кандидат) с возмущениями, пока не
+    истечёт time_budget секунд; все оценки обменов считаются векторно по
+    предрасчитанной матрице pairwise_scores.
+    """
+
+    def __init__(self, scores: np.ndarray, traits: np.ndarray, balance_weight: float):
+        self.scores = scores.astype(float)
+        self.traits = np.asarray(traits, dtype=float)
+        self.balance_weight = balance_weight
+
+    def evaluate(self, pair_sum: np.ndarray, trait_sum: np.ndarray, size: int) -> np.ndarray:
+        mean_score = 2 * pair_sum / (size * (size - 1))
+        balance = trait_balance(trait_sum / size)
+        return (1 - self.balance_weight) * mean_score + self.balance_weight * balance
+
+    def selection(self, members: list[int], exhaustive: bool = False) -> TeamSelection:
+        size = len(members)
+        pair_sum = self.scores[np.ix_(members, members)].sum() / 2
+        mean_score = 2 * pair_sum / (size * (size - 1))
+        balance = float(trait_balance(self.traits[members].mean(axis=0)))
+        objective = float(self.evaluate(pair_sum, self.traits[members].sum(axis=0), size))
+        return TeamSelection(sorted(members), float(mean_score), balance, objective, exhaustive)
+
+    def exhaustive(self, size: int, block: int = 4096) -> TeamSelection:
+        """
+        Полный перебор блоками по block подмножеств, чтобы память не зависела от числа
+        сочетаний. Если size больше половины пула, перебираются не вошедшие в команду:
+        суммы команды получаются из сумм по всему пулу за вычетом их строк.
+        """
+        count = len(self.scores)
+        complement = count - size < size
+        width = count - size if complement else size
+        row_sums = self.scores.sum(axis=1)
+        total_pair_sum = row_sums.sum() / 2
+        total_traits = self.traits.sum(axis=0)
+
+        best_objective, best_subset = -np.inf, None
+        all_subsets = combinations(range(count), width)
+        while chunk := list(islice(all_subsets, block)):
+            subsets = np.array(chunk, dtype=np.intp).reshape(len(chunk), width)
+            pair_sums = self.scores[subsets[:, :, None], subsets[:, None, :]].sum(axis=(1, 2)) / 2
+            trait_sums = self.traits[subsets].sum(axis=1)
+            if complement:
+                pair_sums = total_pair_sum - row_sums[subsets].sum(axis=1) + pair_sums
+                trait_sums = total_traits - trait_sums
+            objectives = self.evaluate(pair_sums, trait_sums, size)
+            best = int(np.argmax(objectives))
+            if objectives[best] > best_objective:
+                best_objective, best_subset = objectives[best], subsets[best]
+
+        members = best_subset.tolist()
+        if complement:
+            members = np.setdiff1d(np.arange(count), best_subset).tolist()
+        return self.selection(members, exhaustive=True)
+
+    def greedy(self, size: int) -> list[int]:
+        first, second = np.unravel_index(np.argmax(self.scores), self.scores.shape)
+        members = [int(first), int(second)]
+        row_sums = self.scores[:, members].sum(axis=1)
+        pair_sum = self.scores[first, second]
+        trait_sum = self.traits[members].sum(axis=0)
+        while len(members) < size:
+            objectives = self.evaluate(
+                pair_sum + row_sums, trait_sum + self.traits, len(members) + 1
+            )
+            objectives[members] = -np.inf
+            best = int(np.argmax(objectives))
+            members.append(best)
+            pair_sum += row_sums[best]
+            row_sums += self.scores[:, best]
+            trait_sum += self.traits[best]
+        return members
+
+    def local_search(self, members: list[int], deadline: float) -> list[int]:
+        size = len(members)
+        members = list(members)
+        inside = np.zeros(len(self.scores), dtype=bool)
+        inside[members] = True
+        row_sums = self.scores[:, members].sum(axis=1)
+        pair_sum = row_sums[members].sum() / 2
+        trait_sum = self.traits[members].sum(axis=0)
+        current = self.evaluate(pair_sum, trait_sum, size)
+
+        while time.monotonic() < deadline:
+            outside = np.flatnonzero(~inside)
+            if not len(outside):
+                break
+            # Замена участника members[i] кандидатом outside[j]
+            pair_sums = (
+                pair_sum
+                + row_sums[outside][None, :]
+                - self.scores[np.ix_(members, outside)]
+                - row_sums[members][:, None]
+            )
+            trait_sums = (
+                trait_sum + self.traits[outside][None, :, :] - self.traits[members][:, None, :]
+            )
+            objectives = self.evaluate(pair_sums, trait_sums, size)
+            i, j = np.unravel_index(np.argmax(objectives), objectives.shape)
+            if objectives[i, j] <= current + 1e-9:
+                break
+            removed, added = members[i], int(outside[j])
+            members[i] = added
+            inside[removed], inside[added] = False, True
+            pair_sum = pair_sums[i, j]
+            row_sums += self.scores[:, added] - self.scores[:, removed]
+            trait_sum = trait_sums[i, j]
+            current = objectives[i, j]
+        return members
+
+    def optimize(self, size: int, time_budget: float, seed: int = 0) -> TeamSelection:
+        count = len(self.scores)
+        if math.comb(count, size) <= OPTIMIZER_EXHAUSTIVE_LIMIT:
+            return self.exhaustive(size)
+
+        deadline = time.monotonic() + time_budget
+        best = self.selection(self.local_search(self.greedy(size), deadline))
+        if count == size:
+            return best
+        # Вне команды может остаться меньше size // 4 кандидатов
+        replaced = min(max(1, size // 4), count - size)
+        rng = np.random.default_rng(seed)
+        while time.monotonic() < deadline:
+            # Возмущение: заменяем часть лучшей команды случайными кандидатами
+            members = list(best.members)
+            outside = np.setdiff1d(np.arange(count), members)
+            positions = rng.choice(size, replaced, replace=False)
+            for position, candidate in zip(positions, rng.choice(outside, replaced, replace=False)):
+                members[position] = int(candidate)
+            candidate = self.selection(self.local_search(members, deadline))
+            if candidate.objective > best.objective:
+                best = candidate
+        return best
+
+
+class OptimizedTeam(NamedTuple):
+    members: list[Employee]
+    compatibilities: list[CompatibilityTraits]  # Совместимость каждого с остальными
+    traits: PersonalTraits  # Средние личные качества команды
+    selection: TeamSelection
+    pool_size: int
+
+
+async def optimize_team(
+    size: int,
+    team_id: str | None = None,
+    time_budget: float | None = None,
+    balance_weight: float | None = None,
+) -> OptimizedTeam | None:
+    """
+    Лучшая команда из size заявителей (Role.PENDING) — всех или одной команды.
+    Пул ограничен OPTIMIZER_MAX_POOL последними заявками. None, если заявителей меньше size.
+    """
+    query = Employee.find(Employee.role == Role.PENDING)
+    if team_id is not None:
+        query = query.find(Employee.team.id == PydanticObjectId(team_id))
+    pool = await query.sort(-Employee.created_at).limit(OPTIMIZER_MAX_POOL).to_list()
+    if len(pool) < size:
+        return None
+
+    longitudes = longitude_matrix(await chart_cache.get_many(pool))
+    traits = np.array([
+        [getattr(employee.personal_traits, field) for field in TRAIT_FIELDS] for employee in pool
+    ])
+    if time_budget is None:
+        time_budget = OPTIMIZER_TIME_BUDGET
+    if balance_weight is None:
+        balance_weight = OPTIMIZER_BALANCE_WEIGHT
+
+    def run() -> TeamSelection:
+        optimizer = TeamOptimizer(pairwise_scores(longitudes), traits, balance_weight)
+        return optimizer.optimize(size, min(time_budget, OPTIMIZER_MAX_TIME_BUDGET))
+
+    selection = await asyncio.to_thread(run)
+    members = [pool[i] for i in selection.members]
+    scores = compatibility_matrix(longitudes[selection.members])
+    compatibilities = [to_traits(np.delete(scores[i], i, axis=0).mean(axis=0)) for i in range(size)]
+    profile = traits[selection.members].mean(axis=0)
+    return OptimizedTeam(
+        members=members,
+        compatibilities=compatibilities,
+        traits=to_personal_traits(profile),
+        selection=selection,
+        pool_size=len(pool),
+    )
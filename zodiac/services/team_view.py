@@ -0,0 +1,112 @@
+from beanie import PydanticObjectId
+
+from zodiac.config import TEAM_VIEW_CACHE_SIZE
+from zodiac.entities.db.team import Team, TeamVersion
+from zodiac.entities.dto.astro import AstroShit
+from zodiac.entities.dto.member import MemberDto
+from zodiac.entities.dto.team import TeamDto, TeamGetResponse
+from zodiac.entities.enums.roles import Role
+from zodiac.services import team_compatibility
+from zodiac.services.cache import LRUCache, SingleFlight
+
+
+async def render_team(team_id: str) -> tuple[int, TeamGetResponse] | None:
+    """
+    Полный ответ GET /teams/{team_id} и версия команды, которой он соответствует.
+    """
+    team = await Team.get(team_id, fetch_links=True)
+    if not team:
+        return None
+    team_members = team.employees or []
+    # Может пересчитать суммы и увеличить team.version
+    compatibilities = await team_compatibility.group_compatibilities(team, team_members)
+    employees = []
+    applicants = []
+    for member in team_members:
+        member_id = str(member.id)
+        data = MemberDto(
+            id=member_id,
+            full_name=member.full_name,
+            birth_date=member.birth_date,
+            birth_place=member.birth_place,
+            email=member.email,
+            phone=member.phone,
+            position=member.position,
+            astro=AstroShit(
+                personal_traits=member.personal_traits,
+                compatibility=compatibilities[member_id],
+            ),
+        )
+        if member.role == Role.EMPLOYEE:
+            employees.append(data)
+        elif member.role == Role.PENDING:
+            applicants.append(data)
+    return team.version, TeamGetResponse(
+        success=True,
+        team=TeamDto(
+            id=str(team.id),
+            name=team.name,
+            description=team.description,
+            employees=employees,
+            applicants=applicants,
+            employees_count=len(employees),
+            applicants_count=len(applicants),
+        ),
+    )
+
+
+def team_etag(team_id: str, version: int) -> str:
+    return f'"{team_id}.{version}"'
+
+
+def team_cache_headers(team_id: str, version: int) -> dict[str, str]:
+    # Ответ зависит от авторизации: кэшировать может только клиент и только с проверкой
+    return {"ETag": team_etag(team_id, version), "Cache-Control": "private, no-cache"}
+
+
+class TeamViewCache:
+    """
+    Готовые ответы GET /teams/{team_id} по (team_id, Team.version).
+
+    Team.version увеличивается после каждого изменения состава, а ответ строится из
+    участников, прочитанных уже после версии, поэтому закэшированный ответ не старше
+    своей версии. Для каждой команды хранится только последняя версия; одновременные
+    запросы одной версии ждут одного расчёта.
+    """
+
+    def __init__(self, maxsize: int = TEAM_VIEW_CACHE_SIZE):
+        self._views: LRUCache[str, tuple[int, TeamGetResponse]] = LRUCache(maxsize)
+        self._rendering: SingleFlight[tuple[str, int], tuple[int, TeamGetResponse] | None] = (
+            SingleFlight()
+        )
+
+    @staticmethod
+    async def version(team_id: str) -> int | None:
+        """
+        Текущая версия команды (None, если её нет) — без загрузки документа целиком.
+        """
+        team = await Team.find_one(Team.id == PydanticObjectId(team_id)).project(TeamVersion)
+        return team.version if team else None
+
+    async def get(self, team_id: str, version: int) -> tuple[int, TeamGetResponse] | None:
+        cached = self._views.get(team_id)
+        if cached is not None and cached[0] >= version:
+            return cached
+        return await self._rendering.run((team_id, version), lambda: self._render(team_id))
+
+    async def _render(self, team_id: str) -> tuple[int, TeamGetResponse] | None:
+        view = await render_team(team_id)
+        if view is None:
+            self._views.pop(team_id)
+            return None
+        cached = self._views.get(team_id)
+        if cached is None or cached[0] <= view[0]:
+            self._views.set(team_id, view)
+        return view
+
+    def clear(self) -> None:
+        self._views.clear()
+        self._rendering.clear()
+
+
+team_views = TeamViewCache()
@@ -0,0 +1,163 @@
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import numpy as np
+
+from zodiac.entities.dto.astro import AspectName, PersonalTraits
+from zodiac.services.astrology import ELEMENTS, PLANET_PAIRS, SIGNS, AstroChart, Planet
+from zodiac.services.compatibility import (
+    ASPECT_NAMES,
+    angular_distance,
+    aspect_indices,
+    aspect_scores,
+)
+
+
+TRAIT_FIELDS = tuple(PersonalTraits.model_fields)
+
+
+class TraitRule(NamedTuple):
+    planet: Planet
+    trait: str
+    signs: tuple[str, ...]  # Знаки, в которых планета усиливает качество
+    houses: tuple[int, ...]  # Дома, в которых планета усиливает качество
+
+
+# Правила в порядке их применения: от порядка зависит округление сумм
+TRAIT_RULES = [
+    TraitRule(Planet.SUN, "leadership", ("Овен", "Лев", "Стрелец"), (1, 10)),
+    TraitRule(Planet.MARS, "leadership", ("Овен", "Скорпион"), (1, 11)),
+    TraitRule(Planet.SATURN, "stress_resilience", ("Телец", "Дева", "Козерог"), (6, 10)),
+    TraitRule(Planet.SATURN, "responsibility", ("Козерог", "Дева"), (6, 10)),
+    TraitRule(Planet.MERCURY, "communication", ("Близнецы", "Весы", "Водолей"), (3, 7)),
+    TraitRule(Planet.VENUS, "communication", ("Близнецы", "Весы"), (3, 7)),
+    TraitRule(Planet.JUPITER, "ambition", ("Стрелец", "Лев"), (9, 10)),
+    TraitRule(Planet.PLUTO, "ambition", ("Скорпион", "Козерог"), (8, 10)),
+]
+SIGN_BONUS = 10.0
+HOUSE_BONUS = 10.0
+ASPECT_DIVISOR = 10.0  # К влиянию каждой планеты аспекта добавляется его балл / ASPECT_DIVISOR
+ELEMENT_SCORES = {"Огонь": 5.0, "Земля": 3.0, "Воздух": 4.0, "Вода": 2.0}
+
+# Гармоничный аспект с планетой усиливает её качество, квадратура снижает стрессоустойчивость
+HARMONIOUS_ASPECTS = {AspectName.TRIN, AspectName.SOEDINENIE}
+ASPECT_TRAITS = {Planet.SUN: "leadership", Planet.MERCURY: "communication", Planet.MARS: "ambition"}
+HARMONIOUS_BONUS = 5.0
+SQUARE_PENALTY = 5.0
+
+# Таблицы правил: строка — правило, столбец — знак или дом (1..12)
+_RULE_PLANETS = np.array([rule.planet for rule in TRAIT_RULES])
+_RULE_TRAITS = [TRAIT_FIELDS.index(rule.trait) for rule in TRAIT_RULES]
+_SIGN_MASKS = np.array([[sign in rule.signs for sign in SIGNS] for rule in TRAIT_RULES])
+_HOUSE_MASKS = np.array([[house in rule.houses for house in range(1, 13)] for rule in TRAIT_RULES])
+_ELEMENT_SCORES = np.array([ELEMENT_SCORES[element] for element in ELEMENTS])
+
+_PAIR_FIRST = np.array([first for first, _ in PLANET_PAIRS])
+_PAIR_SECOND = np.array([second for _, second in PLANET_PAIRS])
+# Пары с участием каждого правила: (len(TRAIT_RULES), len(PLANET_PAIRS))
+_RULE_PAIRS = np.array([[rule.planet in pair for pair in PLANET_PAIRS] for rule in TRAIT_RULES])
+# Надбавка к качествам за гармоничный аспект пары: (len(PLANET_PAIRS), len(TRAIT_FIELDS))
+_PAIR_BONUSES = np.array([
+    [
+        HARMONIOUS_BONUS if any(ASPECT_TRAITS.get(planet) == field for planet in pair) else 0.0
+        for field in TRAIT_FIELDS
+    ]
+    for pair in PLANET_PAIRS
+])
+# По индексу аспекта (aspect_indices); последний элемент — для -1, «нет аспекта»
+_IS_HARMONIOUS = np.array([name in HARMONIOUS_ASPECTS for name in ASPECT_NAMES] + [False])
+_IS_SQUARE = np.array([name == AspectName.KVADRATURA for name in ASPECT_NAMES] + [False])
+_STRESS_RESILIENCE = TRAIT_FIELDS.index("stress_resilience")
+
+
+def house_indices(degrees: np.ndarray, ascendants: np.ndarray) -> np.ndarray:
+    """
+    Номера домов (1..12) для долгот degrees формы (N, K) при асцендентах формы (N,) —
+    векторная версия AstroChart.get_house, включая его граничные случаи.
+    """
+    starts = (ascendants[:, None] + np.arange(12) * 30) % 360
+    ends = (starts + 30) % 360
+    starts, ends = starts[:, None, :], ends[:, None, :]
+    degrees = degrees[..., None]
+    inside = np.where(
+        starts < ends,
+        (starts <= degrees) & (degrees < ends),
+        (degrees >= starts) | (degrees < ends),
+    )
+    return np.where(inside.any(axis=-1), inside.argmax(axis=-1) + 1, 12)
+
+
+def compensated_sum(values: np.ndarray) -> np.ndarray:
+    """
+    Суммы строк values с компенсацией Ноймайера — так же, как встроенный sum()
+    для float в Python 3.12+, чтобы нормировка совпадала с построчным расчётом.
+    """
+    total = values[:, 0].copy()
+    compensation = np.zeros(len(values))
+    for column in values.T[1:]:
+        step = total + column
+        compensation += np.where(
+            np.abs(total) >= np.abs(column), (total - step) + column, (column - step) + total
+        )
+        total = step
+    return total + compensation
+
+
+def personal_traits_matrix(longitudes: np.ndarray, ascendants: np.ndarray) -> np.ndarray:
+    """
+    Личные качества N карт сразу.
+
+    :param longitudes: Долготы планет формы (N, len(Planet)).
+    :param ascendants: Асценденты формы (N,).
+    :return: Массив (N, len(TRAIT_FIELDS)); строка i до последнего бита совпадает
+        с прежним построчным AstroChart.calculate_personal_traits(): слагаемые
+        складываются в том же порядке.
+    """
+    longitudes = np.asarray(longitudes, dtype=float)
+    ascendants = np.asarray(ascendants, dtype=float)
+    count = len(longitudes)
+
+    degrees = longitudes[:, _RULE_PLANETS]
+    signs = ((degrees % 360) // 30).astype(int)
+    houses = house_indices(degrees, ascendants)
+    rules = np.arange(len(TRAIT_RULES))
+    scores = np.where(_SIGN_MASKS[rules, signs], SIGN_BONUS, 0.0) + np.where(
+        _HOUSE_MASKS[rules, houses - 1], HOUSE_BONUS, 0.0
+    )
+
+    angles = angular_distance(longitudes[:, _PAIR_FIRST], longitudes[:, _PAIR_SECOND])
+    aspects = aspect_indices(angles)
+    contributions = aspect_scores(angles) / ASPECT_DIVISOR
+    for pair in range(len(PLANET_PAIRS)):
+        scores += np.where(_RULE_PAIRS[:, pair], contributions[:, pair, None], 0.0)
+    scores += _ELEMENT_SCORES[(degrees // 30).astype(int) % 4]
+
+    traits = np.zeros((count, len(TRAIT_FIELDS)))
+    for rule, trait in zip(rules, _RULE_TRAITS):
+        traits[:, trait] += scores[:, rule]
+
+    harmonious = _IS_HARMONIOUS[aspects]
+    squares = _IS_SQUARE[aspects]
+    for pair in range(len(PLANET_PAIRS)):
+        traits += np.where(harmonious[:, pair, None], _PAIR_BONUSES[pair], 0.0)
+        stress = traits[:, _STRESS_RESILIENCE]
+        traits[:, _STRESS_RESILIENCE] = np.where(
+            squares[:, pair], np.maximum(0, stress - SQUARE_PENALTY), stress
+        )
+
+    total = compensated_sum(traits)
+    positive = total > 0
+    traits[positive] = traits[positive] / total[positive, None] * 100
+    return traits
+
+
+def to_personal_traits(scores: Sequence[float]) -> PersonalTraits:
+    return PersonalTraits(**dict(zip(TRAIT_FIELDS, map(float, scores))))
+
+
+def personal_traits(charts: Sequence[AstroChart]) -> list[PersonalTraits]:
+    if not charts:
+        return []
+    longitudes = np.array([chart.degrees for chart in charts])
+    ascendants = np.array([chart.ascendant for chart in charts])
+    return list(map(to_personal_traits, personal_traits_matrix(longitudes, ascendants)))
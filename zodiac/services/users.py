@@ -0,0 +1,74 @@
+from zodiac.config import USER_CACHE_SINGLE_FLIGHT, USER_CACHE_SIZE, USER_CACHE_TTL
+from zodiac.entities.db.user import User
+from zodiac.entities.dto.health import CacheMetrics
+from zodiac.services.cache import SingleFlight, TTLCache
+
+
+class UserCache:
+    """
+    Пользователи по id для get_current_user: TTL-кэш процесса перед Mongo.
+
+    Изменения пользователя в этом процессе сбрасывают запись через invalidate;
+    изменения из других процессов становятся видны не позже чем через ttl секунд.
+    При single_flight одновременные промахи по одному id ждут одного запроса к Mongo.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = USER_CACHE_SIZE,
+        ttl: float = USER_CACHE_TTL,
+        single_flight: bool = USER_CACHE_SINGLE_FLIGHT,
+    ):
+        self.single_flight = single_flight
+        self._users: TTLCache[str, User] = TTLCache(maxsize, ttl)
+        self._loading: SingleFlight[str, User | None] = SingleFlight()
+        # Загрузка, начатая до invalidate, не должна вернуть в кэш старую запись
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get(self, user_id: str) -> User | None:
+        user = self._users.get(user_id)
+        if user is not None:
+            self.hits += 1
+            return user
+        if not self.single_flight:
+            self.misses += 1
+            return await self._load(user_id)
+
+        if user_id in self._loading:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+        return await self._loading.run(user_id, lambda: self._load(user_id))
+
+    async def _load(self, user_id: str) -> User | None:
+        epoch = self._epoch
+        user = await User.get(user_id)
+        if user is not None and epoch == self._epoch:
+            self._users.set(user_id, user)
+        return user
+
+    def invalidate(self, user_id: str) -> None:
+        self._epoch += 1
+        self._users.pop(user_id)
+        self._loading.forget(user_id)
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self._users.clear()
+        self._loading.clear()
+
+    def metrics(self) -> CacheMetrics:
+        lookups = self.hits + self.misses + self.coalesced
+        return CacheMetrics(
+            size=len(self._users),
+            hits=self.hits,
+            misses=self.misses,
+            coalesced=self.coalesced,
+            hit_rate=self.hits / lookups if lookups else 0.0,
+        )
+
+
+user_cache = UserCache()
@@ -0,0 +1,208 @@
+from collections.abc import Sequence
+from typing import Protocol
+from uuid import NAMESPACE_OID, uuid5
+
+import numpy as np
+
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import (
+    Distance,
+    PointIdsList,
+    PointStruct,
+    VectorParams,
+)
+
+from zodiac.config import QDRANT_COLLECTION, QDRANT_URL, VECTOR_INDEX
+
+
+try:
+    import hnswlib
+except ImportError:  # Необязательная зависимость, нужна только для VECTOR_INDEX=hnsw
+    hnswlib = None
+
+
+class VectorIndex(Protocol):
+    """
+    Индекс векторов сотрудников с поиском по скалярному произведению.
+    """
+
+    async def upsert(self, ids: Sequence[str], vectors: np.ndarray) -> None: ...
+
+    async def remove(self, ids: Sequence[str]) -> None: ...
+
+    async def search(self, query: np.ndarray, limit: int) -> list[tuple[str, float]]: ...
+
+
+class NumpyIndex:
+    """
+    Точный поиск перебором по непрерывной float32-матрице в памяти процесса.
+    """
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self._vectors = np.empty((0, dimension), dtype=np.float32)
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    async def upsert(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        for id_, vector in zip(ids, vectors):
+            row = self._rows.get(id_)
+            if row is None:
+                row = len(self._ids)
+                if row == len(self._vectors):
+                    grown = np.empty((max(2 * row, 1024), self.dimension), dtype=np.float32)
+                    grown[:row] = self._vectors
+                    self._vectors = grown
+                self._ids.append(id_)
+                self._rows[id_] = row
+            self._vectors[row] = vector
+
+    async def remove(self, ids: Sequence[str]) -> None:
+        for id_ in ids:
+            row = self._rows.pop(id_, None)
+            if row is None:
+                continue
+            # На место удалённой строки переносится последняя
+            last = len(self._ids) - 1
+            if row != last:
+                self._vectors[row] = self._vectors[last]
+                self._ids[row] = self._ids[last]
+                self._rows[self._ids[row]] = row
+            self._ids.pop()
+
+    async def search(self, query: np.ndarray, limit: int) -> list[tuple[str, float]]:
+        count = len(self._ids)
+        if not count or limit <= 0:
+            return []
+        scores = self._vectors[:count] @ query.astype(np.float32)
+        top = np.argpartition(-scores, limit)[:limit] if limit < count else np.arange(count)
+        top = top[np.argsort(-scores[top])]
+        return [(self._ids[row], float(scores[row])) for row in top]
+
+
+class HnswIndex:
+    """
+    Приближённый поиск по графу HNSW (hnswlib) в памяти процесса.
+    """
+
+    def __init__(self, dimension: int, m: int = 16, ef_construction: int = 200):
+        self.dimension = dimension
+        self._index = hnswlib.Index(space="ip", dim=dimension)
+        self._index.init_index(max_elements=1024, M=m, ef_construction=ef_construction)
+        self._labels: dict[str, int] = {}
+        self._ids: dict[int, str] = {}
+        self._next_label = 0
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    async def upsert(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        labels = []
+        for id_ in ids:
+            label = self._labels.get(id_)
+            if label is None:
+                label = self._next_label
+                self._next_label += 1
+                self._labels[id_] = label
+                self._ids[label] = id_
+            labels.append(label)
+        if not labels:
+            return
+        if self._next_label > self._index.get_max_elements():
+            self._index.resize_index(max(2 * self._index.get_max_elements(), self._next_label))
+        self._index.add_items(vectors, labels, replace_deleted=False)
+
+    async def remove(self, ids: Sequence[str]) -> None:
+        for id_ in ids:
+            label = self._labels.pop(id_, None)
+            if label is not None:
+                self._index.mark_deleted(label)
+                del self._ids[label]
+
+    async def search(self, query: np.ndarray, limit: int) -> list[tuple[str, float]]:
+        limit = min(limit, len(self._labels))
+        if limit <= 0:
+            return []
+        self._index.set_ef(max(2 * limit, 64))
+        labels, distances = self._index.knn_query(query, k=limit)
+        # Для space="ip" hnswlib возвращает 1 - <x, q>
+        return [
+            (self._ids[int(label)], 1.0 - float(distance))
+            for label, distance in zip(labels[0], distances[0])
+        ]
+
+
+class QdrantIndex:
+    """
+    Коллекция Qdrant, общая для всех процессов приложения.
+    """
+
+    def __init__(self, dimension: int, url: str = QDRANT_URL, collection: str = QDRANT_COLLECTION):
+        self.dimension = dimension
+        self.collection = collection
+        self._client = AsyncQdrantClient(url=url)
+        self._ready = False
+
+    @staticmethod
+    def point_id(employee_id: str) -> str:
+        return str(uuid5(NAMESPACE_OID, employee_id))
+
+    async def _ensure_collection(self) -> None:
+        if self._ready:
+            return
+        if not await self._client.collection_exists(self.collection):
+            await self._client.create_collection(
+                self.collection,
+                vectors_config=VectorParams(size=self.dimension, distance=Distance.DOT),
+            )
+        self._ready = True
+
+    async def upsert(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        if not ids:
+            return
+        await self._ensure_collection()
+        await self._client.upsert(
+            self.collection,
+            points=[
+                PointStruct(
+                    id=self.point_id(id_), vector=vector.tolist(), payload={"employee_id": id_}
+                )
+                for id_, vector in zip(ids, vectors)
+            ],
+        )
+
+    async def remove(self, ids: Sequence[str]) -> None:
+        if not ids:
+            return
+        await self._ensure_collection()
+        await self._client.delete(
+            self.collection, points_selector=PointIdsList(points=list(map(self.point_id, ids)))
+        )
+
+    async def search(self, query: np.ndarray, limit: int) -> list[tuple[str, float]]:
+        if limit <= 0:
+            return []
+        await self._ensure_collection()
+        response = await self._client.query_points(
+            self.collection, query=query.tolist(), limit=limit, with_payload=True
+        )
+        return [(point.payload["employee_id"], point.score) for point in response.points]
+
+
+def create_vector_index(dimension: int, backend: str = VECTOR_INDEX) -> VectorIndex:
+    match backend:
+        case "numpy":
+            return NumpyIndex(dimension)
+        case "hnsw":
+            if hnswlib is None:
+                raise RuntimeError(
+                    "VECTOR_INDEX=hnsw requires hnswlib: install the 'hnsw' extra "
+                    "(uv sync --extra hnsw)"
+                )
+            return HnswIndex(dimension)
+        case "qdrant":
+            return QdrantIndex(dimension)
+    raise ValueError(f"Unknown vector index backend: {backend}")